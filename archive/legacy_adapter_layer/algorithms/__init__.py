@@ -1,7 +1,7 @@
 """Algorithm-level query abstractions."""
 
 from .query_model import QueryCall, QuerySchedule
-from .generalized_query_algorithm import GeneralizedQueryAlgorithm
+from .generalized_query_algorithm import CountedOps, GeneralizedQueryAlgorithm
 
 try:  # optional dependency: qualtran
     from integrations.qualtran.algorithms import build_qsvt_composite, make_query_schedule
@@ -12,6 +12,7 @@ __all__ = [
     "QueryCall",
     "QuerySchedule",
     "GeneralizedQueryAlgorithm",
+    "CountedOps",
 ]
 
 if "make_query_schedule" in globals():
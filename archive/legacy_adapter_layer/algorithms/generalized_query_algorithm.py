@@ -1,20 +1,103 @@
 from __future__ import annotations
 
+import os
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import groupby
 
-from .query_model import QuerySchedule
+from backends.base import CountedOps
+from block_encoding.base import BlockEncoding, BlockEncodingQuery, OperationLike
 
+from .query_model import QueryCall, QuerySchedule
 
-@dataclass
+
+@dataclass(slots=True)
 class QueryExecutionResult:
-    operations: list[object]
+    operations: list[OperationLike] | CountedOps
 
 
 class GeneralizedQueryAlgorithm:
     """Skeleton that consumes a schedule with potentially heterogeneous block encodings."""
 
-    def run(self, schedule: QuerySchedule) -> QueryExecutionResult:
-        ops: list[object] = []
-        for call in schedule:
-            ops.append(call.encoding.query(call.request))
-        return QueryExecutionResult(operations=ops)
\ No newline at end of file
+    def run(
+        self,
+        schedule: QuerySchedule,
+        parallel: bool = False,
+        max_workers: int | None = None,
+        count_only: bool = False,
+    ) -> QueryExecutionResult:
+        """Execute every call in ``schedule`` and collect the emitted operations in order.
+
+        Queries are side-effect free, so ``parallel=True`` splits the schedule into
+        ``max_workers`` contiguous shards and runs them on a thread pool. With
+        ``count_only=True`` no query is executed and the result holds a ``CountedOps``.
+        Consecutive calls to the same encoding are answered with one ``query_batch``.
+        """
+        if count_only:
+            return QueryExecutionResult(operations=self._count(schedule))
+        if parallel:
+            return QueryExecutionResult(operations=self._run_parallel(schedule, max_workers))
+        if schedule.is_dense:
+            return QueryExecutionResult(operations=self._run_dense(schedule))
+        return QueryExecutionResult(
+            operations=_query_runs((call.encoding, call.request) for call in schedule)
+        )
+
+    def _count(self, schedule: QuerySchedule) -> CountedOps:
+        if schedule.is_dense:
+            _, encoding_ids, _, _ = schedule.dense_columns()
+            per_id = Counter(encoding_ids.tolist())
+            encodings = schedule.encodings
+            calls_per_encoding = [(encodings[idx], n) for idx, n in per_id.items()]
+        else:
+            per_key: Counter[int] = Counter()
+            by_key: dict[int, BlockEncoding] = {}
+            for call in schedule:
+                per_key[id(call.encoding)] += 1
+                by_key[id(call.encoding)] = call.encoding
+            calls_per_encoding = [(by_key[key], n) for key, n in per_key.items()]
+
+        counted = CountedOps(n=len(schedule))
+        for encoding, n in calls_per_encoding:
+            meta = encoding.metadata()
+            counted.encoding_counts[meta.name] += n
+            for key, value in meta.logical_cost_hint.items():
+                counted.cost_hints[key] += n * value
+        return counted
+
+    def _run_dense(self, schedule: QuerySchedule) -> list[OperationLike]:
+        encodings = schedule.encodings
+        return _query_runs(
+            (encodings[encoding_id], request)
+            for _, encoding_id, request in schedule.iter_dense_requests()
+        )
+
+    def _run_parallel(
+        self, schedule: QuerySchedule, max_workers: int | None
+    ) -> list[OperationLike]:
+        calls = list(schedule)
+        if not calls:
+            return []
+        n_workers = max(1, min(max_workers or os.cpu_count() or 1, len(calls)))
+        shard_size = -(-len(calls) // n_workers)
+        shards = [calls[start : start + shard_size] for start in range(0, len(calls), shard_size)]
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            shard_ops = list(pool.map(_query_shard, shards))
+        return [op for ops in shard_ops for op in ops]
+
+
+def _query_runs(
+    calls: Iterable[tuple[BlockEncoding, BlockEncodingQuery]],
+) -> list[OperationLike]:
+    # Consecutive calls usually share an encoding; hand each run over as one batch.
+    ops: list[OperationLike] = []
+    for _, run in groupby(calls, key=lambda call: id(call[0])):
+        run = list(run)
+        ops.extend(run[0][0].query_batch([request for _, request in run]))
+    return ops
+
+
+def _query_shard(calls: list[QueryCall]) -> list[OperationLike]:
+    return _query_runs((call.encoding, call.request) for call in calls)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
 
 from block_encoding.base import BlockEncoding, BlockEncodingQuery
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QueryCall:
     index: int
     encoding: BlockEncoding
@@ -13,16 +17,96 @@ class QueryCall:
 
 
 class QuerySchedule:
-    """Allows per-query changes in block-encoding strategy or parameters."""
+    """Allows per-query changes in block-encoding strategy or parameters.
+
+    Calls added with ``append`` are kept as ``QueryCall`` objects. Long schedules can use
+    ``append_dense`` instead, which stores each call as one row of column buffers
+    (index, encoding id, step, parameter vector over ``param_names``) and only rebuilds
+    ``QueryCall`` objects on iteration. The two styles cannot be mixed in one schedule.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, param_names: tuple[str, ...] = ()) -> None:
         self._calls: list[QueryCall] = []
+        self.param_names = tuple(param_names)
+        self._encodings: list[BlockEncoding] = []
+        self._encoding_lookup: dict[int, int] = {}
+        self._indices = array("i")
+        self._encoding_ids = array("i")
+        self._steps = array("i")
+        self._params = np.empty((16, len(self.param_names)), dtype=np.float64)
 
     def append(self, call: QueryCall) -> None:
+        if self._steps:
+            raise ValueError("Cannot append QueryCall objects to a dense schedule.")
         self._calls.append(call)
 
-    def __iter__(self):
-        return iter(self._calls)
+    def register_encoding(self, encoding: BlockEncoding) -> int:
+        """Return the dense encoding id for ``encoding``, registering it on first use."""
+        key = id(encoding)
+        if key not in self._encoding_lookup:
+            self._encoding_lookup[key] = len(self._encodings)
+            self._encodings.append(encoding)
+        return self._encoding_lookup[key]
+
+    def append_dense(self, index: int, encoding_id: int, step: int, params: np.ndarray) -> None:
+        if self._calls:
+            raise ValueError("Cannot append dense rows to a schedule of QueryCall objects.")
+        if encoding_id < 0 or encoding_id >= len(self._encodings):
+            raise ValueError(f"Unknown encoding_id {encoding_id}; use register_encoding first.")
+        row = np.asarray(params, dtype=np.float64).reshape(-1)
+        if row.shape[0] != len(self.param_names):
+            raise ValueError(
+                f"Expected parameters {self.param_names}, got {row.shape[0]} values."
+            )
+        n_rows = len(self._steps)
+        if n_rows == self._params.shape[0]:
+            grown = np.empty((2 * n_rows, len(self.param_names)), dtype=np.float64)
+            grown[:n_rows] = self._params
+            self._params = grown
+        self._params[n_rows] = row
+        self._indices.append(index)
+        self._encoding_ids.append(encoding_id)
+        self._steps.append(step)
+
+    @property
+    def is_dense(self) -> bool:
+        return len(self._steps) > 0
+
+    @property
+    def encodings(self) -> tuple[BlockEncoding, ...]:
+        return tuple(self._encodings)
+
+    def dense_columns(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(indices, encoding_ids, steps, params)`` arrays over the dense rows."""
+        n_rows = len(self._steps)
+        # Copy the array('i') buffers so the schedule stays appendable while callers hold them.
+        return (
+            np.array(self._indices, dtype=np.intc),
+            np.array(self._encoding_ids, dtype=np.intc),
+            np.array(self._steps, dtype=np.intc),
+            self._params[:n_rows],
+        )
+
+    def __iter__(self) -> Iterator[QueryCall]:
+        if not self.is_dense:
+            return iter(self._calls)
+        return self._iter_dense()
+
+    def iter_dense_requests(self) -> Iterator[tuple[int, int, BlockEncodingQuery]]:
+        """Yield ``(index, encoding_id, request)`` for each dense row."""
+        # Reorder parameter columns once so each request matches BlockEncodingQuery.of.
+        order = sorted(range(len(self.param_names)), key=self.param_names.__getitem__)
+        names = tuple(self.param_names[i] for i in order)
+        indices, encoding_ids, steps, params = self.dense_columns()
+        for index, encoding_id, step, row in zip(
+            indices.tolist(), encoding_ids.tolist(), steps.tolist(), params[:, order].tolist()
+        ):
+            request = BlockEncodingQuery(step=step, parameters=tuple(zip(names, row)))
+            yield index, encoding_id, request
+
+    def _iter_dense(self) -> Iterator[QueryCall]:
+        for index, encoding_id, request in self.iter_dense_requests():
+            yield QueryCall(index, self._encodings[encoding_id], request)
 
     def __len__(self) -> int:
-        return len(self._calls)
+        return len(self._calls) + len(self._steps)
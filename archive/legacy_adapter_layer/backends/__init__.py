@@ -1,12 +1,14 @@
 """Backend adapters for circuit generation and resource export."""
 
-from .base import BackendAdapter, BackendProgram
+from .base import BackendAdapter, BackendProgram, CountedOps, OpsPayload
 from .qiskit_backend import QiskitBackendAdapter
 from .resource_estimation import ResourceEstimatorAdapter
 
 __all__ = [
     "BackendAdapter",
     "BackendProgram",
+    "CountedOps",
+    "OpsPayload",
     "QiskitBackendAdapter",
     "ResourceEstimatorAdapter",
 ]
@@ -1,18 +1,50 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
+from block_encoding.base import OperationLike
+
+
+@dataclass(slots=True)
+class OpsPayload:
+    """Operation list tagged with the SDK it targets."""
+
+    sdk: str
+    ops: Sequence[OperationLike]
+
+
+@dataclass(slots=True)
+class CountedOps:
+    """Stand-in for an operations list when only resource counts are needed.
+
+    Stores the number of queries, how many went to each encoding name, and the
+    accumulated ``BlockEncodingMetadata.logical_cost_hint`` totals.
+    """
+
+    n: int
+    encoding_counts: Counter[str] = field(default_factory=Counter)
+    cost_hints: Counter[str] = field(default_factory=Counter)
+
+    def __len__(self) -> int:
+        return self.n
+
 
 @dataclass
 class BackendProgram:
-    """SDK-specific payload plus metadata."""
+    """SDK-specific payload plus metadata.
+
+    In-tree adapters emit ``OpsPayload``; third-party adapters may still use a
+    ``{"sdk": ..., "ops": ...}`` dict.
+    """
 
-    payload: object
+    payload: OpsPayload | dict[str, object]
     metadata: dict[str, object] = field(default_factory=dict)
 
 
 class BackendAdapter(ABC):
     @abstractmethod
-    def compile_operations(self, operations: list[object]) -> BackendProgram:
+    def compile_operations(self, operations: Sequence[OperationLike]) -> BackendProgram:
         raise NotImplementedError
\ No newline at end of file
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 
-from .base import BackendAdapter, BackendProgram
+from block_encoding.base import OperationLike
+
+from .base import BackendAdapter, BackendProgram, OpsPayload
 
 
 @dataclass
@@ -11,9 +14,9 @@ class QiskitBackendAdapter(BackendAdapter):
 
     emit_barriers: bool = False
 
-    def compile_operations(self, operations: list[object]) -> BackendProgram:
+    def compile_operations(self, operations: Sequence[OperationLike]) -> BackendProgram:
         # Intentionally keeps payload neutral until concrete gate translators are added.
         return BackendProgram(
-            payload={"sdk": "qiskit", "ops": operations},
+            payload=OpsPayload(sdk="qiskit", ops=operations),
             metadata={"emit_barriers": self.emit_barriers},
         )
\ No newline at end of file
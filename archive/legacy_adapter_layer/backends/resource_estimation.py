@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from .base import BackendProgram
+from .base import BackendProgram, CountedOps
 
 
 @dataclass
@@ -12,13 +12,20 @@ class ResourceEstimatorAdapter:
     target: str = "logical"
 
     def export(self, program: BackendProgram) -> dict[str, object]:
+        payload = program.payload
+        if isinstance(payload, dict):  # legacy dict payloads from third-party adapters
+            ops = payload.get("ops", [])
+            sdk = payload.get("sdk")
+        else:
+            ops = getattr(payload, "ops", None)
+            sdk = getattr(payload, "sdk", None)
+        summary: dict[str, object] = {"n_operations": len(ops) if ops is not None else None}
+        if isinstance(ops, CountedOps):
+            summary["encoding_counts"] = dict(ops.encoding_counts)
+            summary["cost_hints"] = dict(ops.cost_hints)
         return {
             "target": self.target,
-            "sdk": program.metadata.get("sdk", "unknown"),
-            "summary": {
-                "n_operations": len(program.payload.get("ops", []))
-                if isinstance(program.payload, dict)
-                else None
-            },
+            "sdk": sdk or program.metadata.get("sdk", "unknown"),
+            "summary": summary,
             "payload": program.payload,
-        }
\ No newline at end of file
+        }
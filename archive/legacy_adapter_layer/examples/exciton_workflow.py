@@ -1,3 +1,8 @@
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple
+
 from algorithms import GeneralizedQueryAlgorithm, QueryCall, QuerySchedule
 from backends import QiskitBackendAdapter, ResourceEstimatorAdapter
 from block_encoding import BlockEncoding, BlockEncodingMetadata, BlockEncodingQuery
@@ -5,19 +10,42 @@ from exciton.builder import ExcitonBuilder
 from exciton.model import OrbitalPartition
 from exciton.screening import ConstantScreening
 
+_OP_QUERY = sys.intern("query")
+_OP_ADJOINT = sys.intern("adjoint")
+
+
+class DemoOp(NamedTuple):
+    op: str
+    name: str
+    step: int
+    parameters: tuple[tuple[str, float], ...]
+
+
+@lru_cache(maxsize=None)
+def _demo_metadata(name: str, alpha: float) -> BlockEncodingMetadata:
+    # The instance is shared by every encoding with this name/alpha, so freeze the hints.
+    return BlockEncodingMetadata(
+        name=sys.intern(name),
+        alpha=alpha,
+        ancilla_qubits=2,
+        logical_cost_hint=MappingProxyType({}),
+    )
+
 
 class DemoEncoding(BlockEncoding):
     def __init__(self, name: str, alpha: float) -> None:
-        self._meta = BlockEncodingMetadata(name=name, alpha=alpha, ancilla_qubits=2)
+        self._meta = _demo_metadata(name, alpha)
+        self._query_template = (_OP_QUERY, self._meta.name)
+        self._adjoint_template = (_OP_ADJOINT, self._meta.name)
 
     def metadata(self) -> BlockEncodingMetadata:
         return self._meta
 
-    def query(self, request: BlockEncodingQuery) -> object:
-        return {"op": "query", "name": self._meta.name, "step": request.step, "p": request.parameters}
+    def query(self, request: BlockEncodingQuery) -> DemoOp:
+        return DemoOp(*self._query_template, request.step, request.parameters)
 
-    def adjoint_query(self, request: BlockEncodingQuery) -> object:
-        return {"op": "adjoint", "name": self._meta.name, "step": request.step, "p": request.parameters}
+    def adjoint_query(self, request: BlockEncodingQuery) -> DemoOp:
+        return DemoOp(*self._adjoint_template, request.step, request.parameters)
 
 
 def main() -> None:
@@ -29,8 +57,8 @@ def main() -> None:
     model = builder.build_minimal()
 
     schedule = QuerySchedule()
-    schedule.append(QueryCall(0, DemoEncoding("lcu", 1.5), BlockEncodingQuery(step=0, parameters={"theta": 0.2})))
-    schedule.append(QueryCall(1, DemoEncoding("sparse", 2.0), BlockEncodingQuery(step=1, parameters={"theta": -0.1})))
+    schedule.append(QueryCall(0, DemoEncoding("lcu", 1.5), BlockEncodingQuery.of(step=0, theta=0.2)))
+    schedule.append(QueryCall(1, DemoEncoding("sparse", 2.0), BlockEncodingQuery.of(step=1, theta=-0.1)))
 
     algorithm = GeneralizedQueryAlgorithm()
     result = algorithm.run(schedule)
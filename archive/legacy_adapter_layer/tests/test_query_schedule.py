@@ -1,4 +1,5 @@
-from algorithms import QueryCall, QuerySchedule
+from algorithms import GeneralizedQueryAlgorithm, QueryCall, QuerySchedule
+from backends import QiskitBackendAdapter, ResourceEstimatorAdapter
 from block_encoding import BlockEncoding, BlockEncodingMetadata, BlockEncodingQuery
 
 
@@ -24,3 +25,60 @@ def test_schedule_allows_heterogeneous_encodings():
     names = [call.encoding.metadata().name for call in schedule]
     assert names == ["enc_a", "enc_b"]
     assert len(schedule) == 2
+
+
+def test_dense_schedule_rebuilds_query_calls():
+    schedule = QuerySchedule(param_names=("theta",))
+    enc_a = _Encoding("enc_a")
+    enc_id = schedule.register_encoding(enc_a)
+    assert schedule.register_encoding(enc_a) == enc_id
+
+    schedule.append_dense(0, enc_id, 0, [0.25])
+    schedule.append_dense(1, enc_id, 1, [-0.5])
+
+    calls = list(schedule)
+    assert len(schedule) == 2
+    assert [call.index for call in calls] == [0, 1]
+    assert calls[1].request == BlockEncodingQuery.of(step=1, theta=-0.5)
+    assert GeneralizedQueryAlgorithm().run(schedule).operations == [("enc_a", 0), ("enc_a", 1)]
+
+
+def test_parallel_run_preserves_schedule_order():
+    schedule = QuerySchedule()
+    encodings = [_Encoding("enc_a"), _Encoding("enc_b")]
+    for idx in range(10):
+        schedule.append(QueryCall(idx, encodings[idx % 2], BlockEncodingQuery(step=idx)))
+
+    algorithm = GeneralizedQueryAlgorithm()
+    serial = algorithm.run(schedule).operations
+    parallel = algorithm.run(schedule, parallel=True, max_workers=3).operations
+    assert parallel == serial
+
+
+def test_count_only_run_skips_queries():
+    class _Unqueryable(_Encoding):
+        def query(self, request: BlockEncodingQuery):
+            raise AssertionError("count_only must not execute queries")
+
+    encoding = _Unqueryable("enc_a")
+    encoding._meta = BlockEncodingMetadata(
+        name="enc_a", alpha=1.0, ancilla_qubits=1, logical_cost_hint={"t_count": 4.0}
+    )
+    schedule = QuerySchedule()
+    for idx in range(3):
+        schedule.append(QueryCall(idx, encoding, BlockEncodingQuery(step=idx)))
+
+    counted = GeneralizedQueryAlgorithm().run(schedule, count_only=True).operations
+    assert len(counted) == 3
+    assert counted.encoding_counts == {"enc_a": 3}
+    assert counted.cost_hints == {"t_count": 12.0}
+
+
+def test_resource_export_reports_payload_sdk():
+    schedule = QuerySchedule()
+    schedule.append(QueryCall(0, _Encoding("enc_a"), BlockEncodingQuery(step=0)))
+    ops = GeneralizedQueryAlgorithm().run(schedule).operations
+
+    exported = ResourceEstimatorAdapter().export(QiskitBackendAdapter().compile_operations(ops))
+    assert exported["sdk"] == "qiskit"
+    assert exported["summary"] == {"n_operations": 1}
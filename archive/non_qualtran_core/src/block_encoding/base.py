@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
+from typing import Protocol
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BlockEncodingMetadata:
     name: str
     alpha: float
@@ -12,12 +14,32 @@ class BlockEncodingMetadata:
     logical_cost_hint: dict[str, float] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BlockEncodingQuery:
-    """A query instance can carry runtime knobs for non-stationary algorithms."""
+    """A query instance can carry runtime knobs for non-stationary algorithms.
+
+    ``parameters`` is a name-sorted tuple of ``(name, value)`` pairs so requests are
+    hashable and cheap to build; use ``BlockEncodingQuery.of`` to construct from kwargs.
+    A mapping passed as ``parameters`` is normalized to that form.
+    """
 
     step: int
-    parameters: dict[str, float] = field(default_factory=dict)
+    parameters: tuple[tuple[str, float], ...] = ()
+
+    def __post_init__(self) -> None:
+        if isinstance(self.parameters, Mapping):
+            object.__setattr__(self, "parameters", tuple(sorted(self.parameters.items())))
+
+    @classmethod
+    def of(cls, step: int, **params: float) -> BlockEncodingQuery:
+        return cls(step=step, parameters=tuple(sorted(params.items())))
+
+
+class OperationLike(Protocol):
+    """Structural type for SDK-neutral operation records emitted by block encodings."""
+
+    @property
+    def op(self) -> str: ...
 
 
 class BlockEncoding(ABC):
@@ -28,10 +50,14 @@ class BlockEncoding(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def query(self, request: BlockEncodingQuery) -> object:
+    def query(self, request: BlockEncodingQuery) -> OperationLike:
         """Return an SDK-neutral operation description or backend node handle."""
         raise NotImplementedError
 
+    def query_batch(self, requests: Sequence[BlockEncodingQuery]) -> list[OperationLike]:
+        """Answer several requests at once; override to amortize per-query overhead."""
+        return [self.query(request) for request in requests]
+
     @abstractmethod
-    def adjoint_query(self, request: BlockEncodingQuery) -> object:
+    def adjoint_query(self, request: BlockEncodingQuery) -> OperationLike:
         raise NotImplementedError
\ No newline at end of file
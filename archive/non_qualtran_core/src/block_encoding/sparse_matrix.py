@@ -1,14 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from math import asin, ceil, log2, pi, sqrt
 from typing import Callable
 
-from oracles.function_ir import CompilableFunctionForm
+import numpy as np
+
+from oracles.function_ir import LookupTableForm
 from oracles.reversible_synth import ReversibleCircuit, compile_function_form
 
 from .base import BlockEncoding, BlockEncodingMetadata, BlockEncodingQuery
 
+_OP_QUERY = sys.intern("sparse_block_encoding_query")
+_OP_ADJOINT = sys.intern("sparse_block_encoding_query_dagger")
+# Bound on memoized (row, l_pos) resolutions per block encoding.
+_QUERY_CACHE_SIZE = 4096
+
 
 def _bits_for_range(size: int) -> int:
     if size <= 1:
@@ -16,46 +26,138 @@ def _bits_for_range(size: int) -> int:
     return ceil(log2(size))
 
 
-def _encode_uint(value: int, n_bits: int) -> str:
-    if value < 0 or value >= (1 << n_bits):
-        raise ValueError(f"Value {value} cannot fit in {n_bits} bits.")
-    return format(value, f"0{n_bits}b")
+def _smallest_uint_for(n_bits: int) -> type[np.unsignedinteger]:
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if n_bits <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"n_bits={n_bits} exceeds the 64-bit packed word limit.")
 
 
-def _decode_uint(bits: str) -> int:
-    return int(bits, 2)
-
-def _encode_signed_fixed(value: float, total_bits: int, frac_bits: int) -> str:
+def _encode_signed_fixed_array(values: np.ndarray, total_bits: int, frac_bits: int) -> np.ndarray:
+    """Round and two's-complement encode ``values`` into the smallest fitting uint dtype."""
+    if not 1 <= total_bits <= 64:
+        raise ValueError(f"total_bits={total_bits} must be in [1, 64] for packed storage.")
+    values = np.asarray(values, dtype=float)
+    if not np.isfinite(values).all():
+        value = float(values[~np.isfinite(values)][0])
+        raise ValueError(f"Value {value} cannot be encoded as signed fixed-point.")
     scale = 1 << frac_bits
-    scaled = int(round(value * scale))
     min_int = -(1 << (total_bits - 1))
     max_int = (1 << (total_bits - 1)) - 1
-    if scaled < min_int or scaled > max_int:
+    # Range-check in float before the int64 cast, which would saturate or wrap. The
+    # bound 2**(total_bits - 1) is exact in float64, unlike max_int for 64-bit words.
+    rounded = np.rint(values * scale)
+    bound = float(1 << (total_bits - 1))
+    bad = (rounded < -bound) | (rounded >= bound)
+    if bad.any():
+        value = float(values[bad][0])
         raise ValueError(
             f"Value {value} overflows signed fixed-point [{min_int/scale}, {max_int/scale}] "
             f"for total_bits={total_bits}, frac_bits={frac_bits}."
         )
-    if scaled < 0:
-        scaled = (1 << total_bits) + scaled
-    return format(scaled, f"0{total_bits}b")
+    words = rounded.astype(np.int64).astype(np.uint64) & np.uint64((1 << total_bits) - 1)
+    return words.astype(_smallest_uint_for(total_bits))
+
+
+def _encode_signed_fixed_int(value: float, total_bits: int, frac_bits: int) -> int:
+    return int(_encode_signed_fixed_array(np.array(value), total_bits, frac_bits))
+
+
+def _decode_signed_fixed_int(
+    raw: int | np.ndarray, total_bits: int, frac_bits: int
+) -> float | np.ndarray:
+    """Decode two's-complement words; works elementwise on integer arrays."""
+    shift = np.int64(64 - total_bits)
+    words = np.asarray(raw).astype(np.uint64).view(np.int64)
+    return ((words << shift) >> shift) / float(1 << frac_bits)
+
 
+def _check_index(outer: int, inner: int, shape: tuple[int, ...]) -> None:
+    """Reject out-of-range (and negative, which NumPy would wrap) table indices."""
+    if not (0 <= outer < shape[0] and 0 <= inner < shape[1]):
+        raise KeyError((outer, inner))
 
-def _decode_signed_fixed(bits: str, frac_bits: int) -> float:
-    raw = int(bits, 2)
-    total_bits = len(bits)
-    if bits[0] == "1":
-        raw -= 1 << total_bits
-    return raw / float(1 << frac_bits)
 
+def _check_index_arrays(outer: np.ndarray, inner: np.ndarray, shape: tuple[int, ...]) -> None:
+    """Vectorized ``_check_index``; reports the first offending pair."""
+    bad = (outer < 0) | (outer >= shape[0]) | (inner < 0) | (inner >= shape[1])
+    if bad.any():
+        pos = int(np.argmax(bad))
+        raise KeyError((int(outer[pos]), int(inner[pos])))
 
-@dataclass(frozen=True)
+
+def _packed_index_keys(shape: tuple[int, int], l_bits: int) -> np.ndarray:
+    """Flat ``(outer << l_bits) | l_pos`` keys for every cell of a 2D index table."""
+    outer, l_pos = np.indices(shape, dtype=np.uint64)
+    return ((outer << np.uint64(l_bits)) | l_pos).reshape(-1)
+
+
+def _packed_index_table(table: np.ndarray, l_bits: int) -> dict[int, int]:
+    """Map ``(outer << l_bits) | l_pos`` to ``table[outer, l_pos]`` for a 2D index table."""
+    keys = _packed_index_keys(table.shape, l_bits)
+    return dict(zip(keys.tolist(), table.reshape(-1).tolist()))
+
+
+def _index_truth_table(
+    table: np.ndarray, l_bits: int, out_bits: int, keep: np.ndarray | None = None
+) -> dict[str, str]:
+    """Bitstring view of ``_packed_index_table``, formatted in bulk rather than per entry.
+
+    ``keep`` optionally masks which cells of ``table`` are emitted.
+    """
+    in_bits = _bits_for_range(table.shape[0]) + l_bits
+    keys = _packed_index_keys(table.shape, l_bits)
+    values = table.reshape(-1)
+    if keep is not None:
+        keys = keys[keep.reshape(-1)]
+        values = values[keep.reshape(-1)]
+    return dict(zip(_format_bits_array(keys, in_bits), _format_bits_array(values, out_bits)))
+
+
+def _format_bits_array(values: np.ndarray, n_bits: int) -> list[str]:
+    """Format non-negative integers as fixed-width bitstrings in one vectorized pass."""
+    flat = np.asarray(values, dtype=np.uint64).reshape(-1)
+    shifts = np.arange(n_bits - 1, -1, -1, dtype=np.uint64)
+    digits = (((flat[:, None] >> shifts) & np.uint64(1)) + np.uint64(ord("0"))).astype(np.uint8)
+    return np.ascontiguousarray(digits).view(f"S{n_bits}").reshape(-1).astype(str).tolist()
+
+
+def _vectorized_grid(
+    fn: Callable[[int, int], float], shape: tuple[int, int], kinds: str = "biuf"
+) -> np.ndarray:
+    """Evaluate an array-aware ``fn`` once over the whole ``shape`` index grid."""
+    values = np.asarray(np.fromfunction(fn, shape, dtype=int))
+    if values.dtype.kind not in kinds:
+        raise TypeError(f"Vectorized callable returned unsupported dtype {values.dtype}.")
+    if values.shape != shape:
+        if values.ndim != 0:
+            raise ValueError(f"Vectorized callable returned shape {values.shape}, not {shape}.")
+        values = np.broadcast_to(values, shape)
+    return values
+
+
+@dataclass(frozen=True, slots=True)
 class RowAccessOracle:
-    """Classical row-access oracle O_r: (row, l) -> col(row, l)."""
+    """Classical row-access oracle O_r: (row, l) -> col(row, l).
+
+    Rows with fewer than ``max_row_nnz`` nonzeros are padded with the sentinel
+    ``l + n_cols``; ``row_nnz[row]`` counts the real entries, which must come first.
+    """
 
     n_rows: int
     n_cols: int
     max_row_nnz: int
-    table: dict[tuple[int, int], int]
+    table: np.ndarray = field(compare=False)  # int32, shape (n_rows, max_row_nnz)
+    row_nnz: np.ndarray = field(compare=False)  # int32, shape (n_rows,)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.n_rows, self.n_cols, self.max_row_nnz) == (
+            other.n_rows,
+            other.n_cols,
+            other.max_row_nnz,
+        ) and np.array_equal(self.table, other.table)
 
     @classmethod
     def from_function(
@@ -64,58 +166,96 @@ class RowAccessOracle:
         n_cols: int,
         max_row_nnz: int,
         row_to_col_fn: Callable[[int, int], int],
+        vectorized: bool = False,
     ) -> RowAccessOracle:
-        table: dict[tuple[int, int], int] = {}
-        for row in range(n_rows):
-            for l_pos in range(max_row_nnz):
-                col = int(row_to_col_fn(row, l_pos))
-                if col < 0 or col >= n_cols:
-                    raise ValueError(f"Row oracle produced invalid column index {col}.")
-                table[(row, l_pos)] = col
-        return cls(n_rows=n_rows, n_cols=n_cols, max_row_nnz=max_row_nnz, table=table)
+        """Tabulate ``row_to_col_fn`` per entry, or in one array call if ``vectorized``."""
+        if vectorized:
+            table = _vectorized_grid(row_to_col_fn, (n_rows, max_row_nnz), kinds="biu")
+        else:
+            table = np.empty((n_rows, max_row_nnz), dtype=np.int64)
+            for row in range(n_rows):
+                for l_pos in range(max_row_nnz):
+                    table[row, l_pos] = int(row_to_col_fn(row, l_pos))
+        return cls.from_array(n_rows=n_rows, n_cols=n_cols, table=table)
 
-    def lookup(self, row: int, l_pos: int) -> int:
-        return self.table[(row, l_pos)]
+    @classmethod
+    def from_array(cls, n_rows: int, n_cols: int, table: np.ndarray) -> RowAccessOracle:
+        """Build from a precomputed (n_rows, max_row_nnz) column-index array.
+
+        Entries equal to ``l + n_cols`` are padding and must trail the real entries.
+        """
+        table = np.asarray(table)
+        if table.ndim != 2 or table.shape[0] != n_rows:
+            raise ValueError(f"Row oracle table must have shape ({n_rows}, max_row_nnz).")
+        l_pos = np.arange(table.shape[1])
+        is_pad = table == l_pos + n_cols
+        bad = (table < 0) | ((table >= n_cols) & ~is_pad)
+        if bad.any():
+            raise ValueError(f"Row oracle produced invalid column index {int(table[bad][0])}.")
+        row_nnz = (~is_pad).sum(axis=1)
+        if not np.array_equal(is_pad, l_pos >= row_nnz[:, None]):
+            raise ValueError("Row oracle padding sentinels must follow all real entries.")
+        return cls(
+            n_rows=n_rows,
+            n_cols=n_cols,
+            max_row_nnz=table.shape[1],
+            table=np.ascontiguousarray(table, dtype=np.int32),
+            row_nnz=row_nnz.astype(np.int32),
+        )
 
-    def compile_truth_table(self) -> dict[str, str]:
-        row_bits = _bits_for_range(self.n_rows)
-        l_bits = _bits_for_range(self.max_row_nnz)
-        col_bits = _bits_for_range(self.n_cols)
-        compiled: dict[str, str] = {}
-        for (row, l_pos), col in self.table.items():
-            key = _encode_uint(row, row_bits) + _encode_uint(l_pos, l_bits)
-            compiled[key] = _encode_uint(col, col_bits)
-        return compiled
+    @property
+    def padding_mask(self) -> np.ndarray:
+        """Boolean (n_rows, max_row_nnz) mask of sentinel slots."""
+        return np.arange(self.max_row_nnz) >= self.row_nnz[:, None]
 
-    def compile_reversible_circuit(self) -> ReversibleCircuit:
-        row_bits = _bits_for_range(self.n_rows)
+    def lookup(self, row: int, l_pos: int) -> int:
+        _check_index(row, l_pos, self.table.shape)
+        if l_pos >= self.row_nnz[row]:
+            return l_pos + self.n_cols
+        return int(self.table[row, l_pos])
+
+    def to_lookup_table(self) -> LookupTableForm:
+        """Packed table keyed by ``(row << l_bits) | l_pos``, sentinels included."""
         l_bits = _bits_for_range(self.max_row_nnz)
-        in_bits = row_bits + l_bits
-        out_bits = _bits_for_range(self.n_cols)
-
-        def packed_fn(x: int) -> int:
-            l_mask = (1 << l_bits) - 1
-            l_pos = x & l_mask
-            row = x >> l_bits
-            return self.lookup(row=row, l_pos=l_pos)
-
-        form = CompilableFunctionForm(
-            n_input_bits=in_bits,
-            n_output_bits=out_bits,
-            fn=packed_fn,
+        padded = bool((self.row_nnz < self.max_row_nnz).any())
+        out_range = self.n_cols + self.max_row_nnz if padded else self.n_cols
+        return LookupTableForm(
+            n_input_bits=_bits_for_range(self.n_rows) + l_bits,
+            n_output_bits=_bits_for_range(out_range),
+            table=_packed_index_table(self.table, l_bits),
             name="row_access_oracle",
         )
-        return compile_function_form(form)
 
+    def compile_truth_table(self) -> dict[str, str]:
+        """Bitstring table of the real entries; sentinel slots are omitted."""
+        keep = None if bool((self.row_nnz == self.max_row_nnz).all()) else ~self.padding_mask
+        return _index_truth_table(
+            self.table, _bits_for_range(self.max_row_nnz), _bits_for_range(self.n_cols), keep
+        )
+
+    def compile_reversible_circuit(self) -> ReversibleCircuit:
+        # The table is already fully enumerated, so hand the synthesizer the packed
+        # lookup table directly instead of a callable it would invoke per input.
+        return compile_function_form(self.to_lookup_table())
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ColAccessOracle:
     """Classical column-access oracle O_c: (col, l) -> row(col, l)."""
 
     n_rows: int
     n_cols: int
     max_col_nnz: int
-    table: dict[tuple[int, int], int]
+    table: np.ndarray = field(compare=False)  # int32, shape (n_cols, max_col_nnz)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.n_rows, self.n_cols, self.max_col_nnz) == (
+            other.n_rows,
+            other.n_cols,
+            other.max_col_nnz,
+        ) and np.array_equal(self.table, other.table)
 
     @classmethod
     def from_function(
@@ -124,59 +264,81 @@ class ColAccessOracle:
         n_cols: int,
         max_col_nnz: int,
         col_to_row_fn: Callable[[int, int], int],
+        vectorized: bool = False,
     ) -> ColAccessOracle:
-        table: dict[tuple[int, int], int] = {}
-        for col in range(n_cols):
-            for l_pos in range(max_col_nnz):
-                row = int(col_to_row_fn(col, l_pos))
-                if row < 0 or row >= n_rows:
-                    raise ValueError(f"Col oracle produced invalid row index {row}.")
-                table[(col, l_pos)] = row
-        return cls(n_rows=n_rows, n_cols=n_cols, max_col_nnz=max_col_nnz, table=table)
+        """Tabulate ``col_to_row_fn`` per entry, or in one array call if ``vectorized``."""
+        if vectorized:
+            table = _vectorized_grid(col_to_row_fn, (n_cols, max_col_nnz), kinds="biu")
+        else:
+            table = np.empty((n_cols, max_col_nnz), dtype=np.int64)
+            for col in range(n_cols):
+                for l_pos in range(max_col_nnz):
+                    table[col, l_pos] = int(col_to_row_fn(col, l_pos))
+        return cls.from_array(n_rows=n_rows, n_cols=n_cols, table=table)
 
-    def lookup(self, col: int, l_pos: int) -> int:
-        return self.table[(col, l_pos)]
+    @classmethod
+    def from_array(cls, n_rows: int, n_cols: int, table: np.ndarray) -> ColAccessOracle:
+        """Build from a precomputed (n_cols, max_col_nnz) row-index array."""
+        table = np.asarray(table)
+        if table.ndim != 2 or table.shape[0] != n_cols:
+            raise ValueError(f"Col oracle table must have shape ({n_cols}, max_col_nnz).")
+        bad = (table < 0) | (table >= n_rows)
+        if bad.any():
+            raise ValueError(f"Col oracle produced invalid row index {int(table[bad][0])}.")
+        return cls(
+            n_rows=n_rows,
+            n_cols=n_cols,
+            max_col_nnz=table.shape[1],
+            table=np.ascontiguousarray(table, dtype=np.int32),
+        )
 
-    def compile_truth_table(self) -> dict[str, str]:
-        col_bits = _bits_for_range(self.n_cols)
-        l_bits = _bits_for_range(self.max_col_nnz)
-        row_bits = _bits_for_range(self.n_rows)
-        compiled: dict[str, str] = {}
-        for (col, l_pos), row in self.table.items():
-            key = _encode_uint(col, col_bits) + _encode_uint(l_pos, l_bits)
-            compiled[key] = _encode_uint(row, row_bits)
-        return compiled
+    def lookup(self, col: int, l_pos: int) -> int:
+        _check_index(col, l_pos, self.table.shape)
+        return int(self.table[col, l_pos])
 
-    def compile_reversible_circuit(self) -> ReversibleCircuit:
-        col_bits = _bits_for_range(self.n_cols)
+    def to_lookup_table(self) -> LookupTableForm:
+        """Packed table keyed by ``(col << l_bits) | l_pos``."""
         l_bits = _bits_for_range(self.max_col_nnz)
-        in_bits = col_bits + l_bits
-        out_bits = _bits_for_range(self.n_rows)
-
-        def packed_fn(x: int) -> int:
-            l_mask = (1 << l_bits) - 1
-            l_pos = x & l_mask
-            col = x >> l_bits
-            return self.lookup(col=col, l_pos=l_pos)
-
-        form = CompilableFunctionForm(
-            n_input_bits=in_bits,
-            n_output_bits=out_bits,
-            fn=packed_fn,
+        return LookupTableForm(
+            n_input_bits=_bits_for_range(self.n_cols) + l_bits,
+            n_output_bits=_bits_for_range(self.n_rows),
+            table=_packed_index_table(self.table, l_bits),
             name="col_access_oracle",
         )
-        return compile_function_form(form)
+
+    def compile_truth_table(self) -> dict[str, str]:
+        return _index_truth_table(
+            self.table, _bits_for_range(self.max_col_nnz), _bits_for_range(self.n_rows)
+        )
+
+    def compile_reversible_circuit(self) -> ReversibleCircuit:
+        return compile_function_form(self.to_lookup_table())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EntryBinaryOracle:
-    """Classical entry oracle O_A: (row, col) -> fixed-point bitstring for A[row, col]."""
+    """Classical entry oracle O_A: (row, col) -> fixed-point bitstring for A[row, col].
+
+    ``table[row, col]`` keeps each two's-complement word packed in the smallest unsigned
+    dtype that holds ``value_bits``; bitstrings are only formatted by ``lookup_bits`` and
+    ``compile_truth_table``.
+    """
 
     n_rows: int
     n_cols: int
     value_bits: int
     frac_bits: int
-    table: dict[tuple[int, int], str]
+    table: np.ndarray = field(compare=False)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.n_rows, self.n_cols, self.value_bits, self.frac_bits) == (
+            other.n_rows,
+            other.n_cols,
+            other.value_bits,
+            other.frac_bits,
+        ) and np.array_equal(self.table, other.table)
 
     @classmethod
     def from_function(
@@ -186,17 +348,17 @@ class EntryBinaryOracle:
         value_bits: int,
         frac_bits: int,
         entry_fn: Callable[[int, int], float],
+        vectorized: bool = False,
     ) -> EntryBinaryOracle:
-        table: dict[tuple[int, int], str] = {}
-        for row in range(n_rows):
-            for col in range(n_cols):
-                value = float(entry_fn(row, col))
-                table[(row, col)] = _encode_signed_fixed(
-                    value=value, total_bits=value_bits, frac_bits=frac_bits
-                )
-        return cls(
-            n_rows=n_rows, n_cols=n_cols, value_bits=value_bits, frac_bits=frac_bits, table=table
-        )
+        """Tabulate ``entry_fn`` per entry, or in one array call if ``vectorized``."""
+        if vectorized:
+            values = _vectorized_grid(entry_fn, (n_rows, n_cols))
+        else:
+            values = np.empty((n_rows, n_cols), dtype=float)
+            for row in range(n_rows):
+                for col in range(n_cols):
+                    values[row, col] = float(entry_fn(row, col))
+        return cls.from_dense_numpy(values, value_bits=value_bits, frac_bits=frac_bits)
 
     @classmethod
     def from_dense(
@@ -204,37 +366,120 @@ class EntryBinaryOracle:
     ) -> EntryBinaryOracle:
         if not matrix or not matrix[0]:
             raise ValueError("Matrix must be non-empty.")
-        n_rows = len(matrix)
         n_cols = len(matrix[0])
         for row in matrix:
             if len(row) != n_cols:
                 raise ValueError("Matrix must be rectangular.")
-        return cls.from_function(
-            n_rows=n_rows,
-            n_cols=n_cols,
+        return cls.from_dense_numpy(
+            np.asarray(matrix, dtype=float), value_bits=value_bits, frac_bits=frac_bits
+        )
+
+    @classmethod
+    def from_dense_numpy(
+        cls, matrix: np.ndarray, value_bits: int, frac_bits: int
+    ) -> EntryBinaryOracle:
+        values = np.asarray(matrix, dtype=float)
+        if values.ndim != 2 or values.size == 0:
+            raise ValueError("Matrix must be a non-empty 2D array.")
+        return cls(
+            n_rows=values.shape[0],
+            n_cols=values.shape[1],
             value_bits=value_bits,
             frac_bits=frac_bits,
-            entry_fn=lambda i, j: matrix[i][j],
+            table=_encode_signed_fixed_array(values, total_bits=value_bits, frac_bits=frac_bits),
         )
 
     def lookup_bits(self, row: int, col: int) -> str:
-        return self.table[(row, col)]
+        _check_index(row, col, self.table.shape)
+        return format(int(self.table[row, col]), f"0{self.value_bits}b")
 
     def lookup_value(self, row: int, col: int) -> float:
-        bits = self.lookup_bits(row, col)
-        return _decode_signed_fixed(bits, frac_bits=self.frac_bits)
+        _check_index(row, col, self.table.shape)
+        return float(
+            _decode_signed_fixed_int(
+                self.table[row, col], total_bits=self.value_bits, frac_bits=self.frac_bits
+            )
+        )
 
-    def compile_truth_table(self) -> dict[str, str]:
-        row_bits = _bits_for_range(self.n_rows)
+    def to_dense(self) -> np.ndarray:
+        """Decode the whole table back to an (n_rows, n_cols) float array."""
+        return _decode_signed_fixed_int(
+            self.table, total_bits=self.value_bits, frac_bits=self.frac_bits
+        )
+
+    def compile_truth_table_packed(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``(keys, values)`` arrays with keys packed as ``(row << col_bits) | col``."""
         col_bits = _bits_for_range(self.n_cols)
-        compiled: dict[str, str] = {}
-        for (row, col), out_bits in self.table.items():
-            key = _encode_uint(row, row_bits) + _encode_uint(col, col_bits)
-            compiled[key] = out_bits
-        return compiled
+        rows, cols = np.indices((self.n_rows, self.n_cols), dtype=np.uint64)
+        keys = (rows << np.uint64(col_bits)) | cols
+        return keys.reshape(-1), self.table.reshape(-1)
+
+    def to_lookup_table(self) -> LookupTableForm:
+        """Packed table keyed by ``(row << col_bits) | col``."""
+        keys, values = self.compile_truth_table_packed()
+        return LookupTableForm(
+            n_input_bits=_bits_for_range(self.n_rows) + _bits_for_range(self.n_cols),
+            n_output_bits=self.value_bits,
+            table=dict(zip(keys.tolist(), values.tolist())),
+            name="entry_oracle",
+        )
+
+    def compile_truth_table(self) -> dict[str, str]:
+        keys, values = self.compile_truth_table_packed()
+        in_bits = _bits_for_range(self.n_rows) + _bits_for_range(self.n_cols)
+        return dict(
+            zip(_format_bits_array(keys, in_bits), _format_bits_array(values, self.value_bits))
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LazyEntryBinaryOracle:
+    """On-demand counterpart of ``EntryBinaryOracle`` for sparsely queried matrices.
+
+    ``entry_fn`` is only evaluated for the ``(row, col)`` pairs actually looked up, and
+    each encoded word is memoized. ``materialize`` returns the dense oracle.
+    """
+
+    n_rows: int
+    n_cols: int
+    value_bits: int
+    frac_bits: int
+    entry_fn: Callable[[int, int], float]
+    _word: Callable[[int, int], int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        entry_fn, value_bits, frac_bits = self.entry_fn, self.value_bits, self.frac_bits
+
+        def word(row: int, col: int) -> int:
+            return _encode_signed_fixed_int(float(entry_fn(row, col)), value_bits, frac_bits)
+
+        object.__setattr__(self, "_word", lru_cache(maxsize=None)(word))
+
+    def _checked_word(self, row: int, col: int) -> int:
+        _check_index(row, col, (self.n_rows, self.n_cols))
+        return self._word(row, col)
+
+    def lookup_bits(self, row: int, col: int) -> str:
+        return format(self._checked_word(row, col), f"0{self.value_bits}b")
+
+    def lookup_value(self, row: int, col: int) -> float:
+        return float(
+            _decode_signed_fixed_int(
+                self._checked_word(row, col), total_bits=self.value_bits, frac_bits=self.frac_bits
+            )
+        )
+
+    def materialize(self) -> EntryBinaryOracle:
+        return EntryBinaryOracle.from_function(
+            n_rows=self.n_rows,
+            n_cols=self.n_cols,
+            value_bits=self.value_bits,
+            frac_bits=self.frac_bits,
+            entry_fn=self.entry_fn,
+        )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AmplitudeEncoding:
     value: float
     normalized_abs: float
@@ -242,33 +487,79 @@ class AmplitudeEncoding:
     phase: float
 
 
-@dataclass(frozen=True)
+# Padding slots of the row oracle carry no matrix entry, so they load a zero amplitude.
+_PADDING_AMPLITUDE = AmplitudeEncoding(value=0.0, normalized_abs=0.0, theta=0.0, phase=0.0)
+
+
+@dataclass(frozen=True, slots=True)
 class FullDataLoadingAmplitudeOracle:
     """Amplitude oracle built from binary entry loading.
 
     This is the "full data-loading" version: all entries are loaded classically
-    as fixed-point bitstrings, then mapped to rotation/phase data.
+    as fixed-point bitstrings, then mapped to rotation/phase data. With a
+    ``LazyEntryBinaryOracle`` nothing is precomputed and entries are encoded per call.
     """
 
-    entry_oracle: EntryBinaryOracle
+    entry_oracle: EntryBinaryOracle | LazyEntryBinaryOracle
     alpha: float
+    _value: np.ndarray | None = field(init=False, repr=False, compare=False)
+    _normalized_abs: np.ndarray | None = field(init=False, repr=False, compare=False)
+    _theta: np.ndarray | None = field(init=False, repr=False, compare=False)
+    _phase: np.ndarray | None = field(init=False, repr=False, compare=False)
 
-    def encode(self, row: int, col: int) -> AmplitudeEncoding:
+    def __post_init__(self) -> None:
         if self.alpha <= 0:
             raise ValueError("alpha must be positive.")
-        value = self.entry_oracle.lookup_value(row, col)
-        normalized_abs = min(abs(value) / self.alpha, 1.0)
-        theta = 2.0 * asin(sqrt(normalized_abs))
-        phase = 0.0 if value >= 0 else pi
+        if isinstance(self.entry_oracle, LazyEntryBinaryOracle):
+            for name in ("_value", "_normalized_abs", "_theta", "_phase"):
+                object.__setattr__(self, name, None)
+            return
+        # Every entry is loaded classically anyway, so resolve all rotations once up front.
+        values = self.entry_oracle.to_dense()
+        normalized_abs = np.minimum(np.abs(values) / self.alpha, 1.0)
+        object.__setattr__(self, "_value", values)
+        object.__setattr__(self, "_normalized_abs", normalized_abs)
+        object.__setattr__(self, "_theta", 2.0 * np.arcsin(np.sqrt(normalized_abs)))
+        object.__setattr__(self, "_phase", np.where(values >= 0, 0.0, np.pi))
+
+    def encode(self, row: int, col: int) -> AmplitudeEncoding:
+        if self._value is None:
+            value = self.entry_oracle.lookup_value(row, col)
+            normalized_abs = min(abs(value) / self.alpha, 1.0)
+            return AmplitudeEncoding(
+                value=value,
+                normalized_abs=normalized_abs,
+                theta=2.0 * asin(sqrt(normalized_abs)),
+                phase=0.0 if value >= 0 else pi,
+            )
+        _check_index(row, col, self._value.shape)
         return AmplitudeEncoding(
-            value=value,
-            normalized_abs=normalized_abs,
-            theta=theta,
-            phase=phase,
+            value=float(self._value[row, col]),
+            normalized_abs=float(self._normalized_abs[row, col]),
+            theta=float(self._theta[row, col]),
+            phase=float(self._phase[row, col]),
         )
 
+    def encode_batch(
+        self, rows: np.ndarray, cols: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized ``encode``: ``(value, normalized_abs, theta, phase)`` arrays."""
+        if self._value is None:
+            amps = [self.encode(row, col) for row, col in zip(rows.tolist(), cols.tolist())]
+            return tuple(
+                np.array([getattr(amp, name) for amp in amps], dtype=float)
+                for name in ("value", "normalized_abs", "theta", "phase")
+            )
+        _check_index_arrays(rows, cols, self._value.shape)
+        return (
+            self._value[rows, cols],
+            self._normalized_abs[rows, cols],
+            self._theta[rows, cols],
+            self._phase[rows, cols],
+        )
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class SparseOracleBundle:
     row_oracle: RowAccessOracle
     col_oracle: ColAccessOracle
@@ -287,31 +578,75 @@ class SparseOracleBundle:
         value_bits: int,
         frac_bits: int,
         alpha: float,
+        lazy: bool = False,
+        vectorized: bool = False,
     ) -> SparseOracleBundle:
+        """Build all three oracles.
+
+        ``lazy=True`` defers evaluating ``entry_fn`` to lookup; ``vectorized=True`` calls
+        each callable once on whole index arrays instead of once per entry.
+        """
         row_oracle = RowAccessOracle.from_function(
-            n_rows=n_rows, n_cols=n_cols, max_row_nnz=max_row_nnz, row_to_col_fn=row_to_col_fn
+            n_rows=n_rows,
+            n_cols=n_cols,
+            max_row_nnz=max_row_nnz,
+            row_to_col_fn=row_to_col_fn,
+            vectorized=vectorized,
         )
         col_oracle = ColAccessOracle.from_function(
-            n_rows=n_rows, n_cols=n_cols, max_col_nnz=max_col_nnz, col_to_row_fn=col_to_row_fn
-        )
-        entry_oracle = EntryBinaryOracle.from_function(
             n_rows=n_rows,
             n_cols=n_cols,
-            value_bits=value_bits,
-            frac_bits=frac_bits,
-            entry_fn=entry_fn,
+            max_col_nnz=max_col_nnz,
+            col_to_row_fn=col_to_row_fn,
+            vectorized=vectorized,
         )
+        if lazy:
+            entry_oracle = LazyEntryBinaryOracle(
+                n_rows=n_rows,
+                n_cols=n_cols,
+                value_bits=value_bits,
+                frac_bits=frac_bits,
+                entry_fn=entry_fn,
+            )
+        else:
+            entry_oracle = EntryBinaryOracle.from_function(
+                n_rows=n_rows,
+                n_cols=n_cols,
+                value_bits=value_bits,
+                frac_bits=frac_bits,
+                entry_fn=entry_fn,
+                vectorized=vectorized,
+            )
         amplitude_oracle = FullDataLoadingAmplitudeOracle(entry_oracle=entry_oracle, alpha=alpha)
         return cls(
             row_oracle=row_oracle, col_oracle=col_oracle, amplitude_oracle=amplitude_oracle
         )
 
 
+@dataclass(frozen=True, slots=True)
+class SparseQueryOp:
+    """SDK-neutral description of one sparse block-encoding query (or its adjoint)."""
+
+    step: int
+    row: int
+    l_pos: int
+    col: int
+    theta: float
+    phase: float
+    value: float
+    normalized_abs: float
+    is_adjoint: bool = False
+
+    @property
+    def op(self) -> str:
+        return _OP_ADJOINT if self.is_adjoint else _OP_QUERY
+
+
 class SparseMatrixBlockEncoding(BlockEncoding):
     """Sparse block-encoding skeleton with separate row/col/entry-amplitude oracles.
 
-    This class returns SDK-neutral operation dictionaries. Backend adapters can
-    lower these dictionaries to Qiskit, Qualtran, or estimator IR later.
+    This class returns immutable ``SparseQueryOp`` records. Backend adapters can
+    lower these records to Qiskit, Qualtran, or estimator IR later.
     """
 
     def __init__(self, bundle: SparseOracleBundle, name: str = "sparse_full_load") -> None:
@@ -322,28 +657,78 @@ class SparseMatrixBlockEncoding(BlockEncoding):
             ancilla_qubits=1,
             logical_cost_hint={"query_oracles": 3.0},
         )
+        self._resolve = lru_cache(maxsize=_QUERY_CACHE_SIZE)(self._resolve_entry)
 
     def metadata(self) -> BlockEncodingMetadata:
         return self._meta
 
-    def query(self, request: BlockEncodingQuery) -> object:
-        row = int(request.parameters["row"])
-        l_pos = int(request.parameters["l_pos"])
-        col = self.bundle.row_oracle.lookup(row, l_pos)
-        amp = self.bundle.amplitude_oracle.encode(row, col)
-        return {
-            "op": "sparse_block_encoding_query",
-            "step": request.step,
-            "row": row,
-            "l_pos": l_pos,
-            "col": col,
-            "theta": amp.theta,
-            "phase": amp.phase,
-            "value": amp.value,
-            "normalized_abs": amp.normalized_abs,
-        }
-
-    def adjoint_query(self, request: BlockEncodingQuery) -> object:
-        payload = self.query(request)
-        payload["op"] = "sparse_block_encoding_query_dagger"
-        return payload
+    def _resolve_entry(self, row: int, l_pos: int) -> tuple[int, AmplitudeEncoding]:
+        """Column and amplitude for slot ``l_pos`` of ``row``; memoized by ``_resolve``."""
+        row_oracle = self.bundle.row_oracle
+        col = row_oracle.lookup(row, l_pos)
+        if col >= row_oracle.n_cols:
+            return col, _PADDING_AMPLITUDE
+        return col, self.bundle.amplitude_oracle.encode(row, col)
+
+    def query(self, request: BlockEncodingQuery) -> SparseQueryOp:
+        params = dict(request.parameters)
+        row = int(params["row"])
+        l_pos = int(params["l_pos"])
+        col, amp = self._resolve(row, l_pos)
+        return SparseQueryOp(
+            step=request.step,
+            row=row,
+            l_pos=l_pos,
+            col=col,
+            theta=amp.theta,
+            phase=amp.phase,
+            value=amp.value,
+            normalized_abs=amp.normalized_abs,
+        )
+
+    def query_batch(self, requests: Sequence[BlockEncodingQuery]) -> list[SparseQueryOp]:
+        n = len(requests)
+        if n == 0:
+            return []
+        params = [dict(request.parameters) for request in requests]
+        rows = np.fromiter((int(p["row"]) for p in params), dtype=np.intp, count=n)
+        l_pos = np.fromiter((int(p["l_pos"]) for p in params), dtype=np.intp, count=n)
+        n_cols = self.bundle.row_oracle.n_cols
+        _check_index_arrays(rows, l_pos, self.bundle.row_oracle.table.shape)
+        cols = self.bundle.row_oracle.table[rows, l_pos].astype(np.intp)
+        real = cols < n_cols
+        if real.all():
+            amps = self.bundle.amplitude_oracle.encode_batch(rows, cols)
+        else:
+            # Padding slots keep the zero amplitude; only stored entries reach the oracle.
+            amps = tuple(np.zeros(n) for _ in range(4))
+            if real.any():
+                encoded = self.bundle.amplitude_oracle.encode_batch(rows[real], cols[real])
+                for out, arr in zip(amps, encoded):
+                    out[real] = arr
+        values, normalized_abs, theta, phase = amps
+        return [
+            SparseQueryOp(
+                step=request.step,
+                row=row,
+                l_pos=pos,
+                col=col,
+                theta=th,
+                phase=ph,
+                value=val,
+                normalized_abs=norm,
+            )
+            for request, row, pos, col, th, ph, val, norm in zip(
+                requests,
+                rows.tolist(),
+                l_pos.tolist(),
+                cols.tolist(),
+                theta.tolist(),
+                phase.tolist(),
+                values.tolist(),
+                normalized_abs.tolist(),
+            )
+        ]
+
+    def adjoint_query(self, request: BlockEncodingQuery) -> SparseQueryOp:
+        return replace(self.query(request), is_adjoint=True)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class SynthConfig:
@@ -47,6 +49,27 @@ class AffineXorForm:
     matrix: tuple[tuple[int, ...], ...]
     offset_bits: tuple[int, ...]
     name: str = "affine_xor"
+    _row_masks: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    _offset_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Pack each matrix row (and the offset) into an int so evaluate() is AND + popcount.
+        row_masks = tuple(
+            sum(coeff << in_bit for in_bit, coeff in enumerate(row)) for row in self.matrix
+        )
+        offset_mask = sum(bit << out_bit for out_bit, bit in enumerate(self.offset_bits))
+        object.__setattr__(self, "_row_masks", row_masks)
+        object.__setattr__(self, "_offset_mask", offset_mask)
+
+    @property
+    def row_masks(self) -> tuple[int, ...]:
+        """Matrix rows packed as ints: bit ``in_bit`` of entry ``out_bit`` is A[out_bit][in_bit]."""
+        return self._row_masks
+
+    @property
+    def offset_mask(self) -> int:
+        """``offset_bits`` packed as an int, bit ``out_bit`` = b[out_bit]."""
+        return self._offset_mask
 
     def validate(self) -> None:
         if len(self.matrix) != self.n_output_bits:
@@ -65,18 +88,24 @@ class AffineXorForm:
         max_x = 1 << self.n_input_bits
         if x < 0 or x >= max_x:
             raise ValueError(f"x={x} outside n_input_bits={self.n_input_bits}.")
-        out = 0
-        for out_bit, row in enumerate(self.matrix):
-            bit_val = self.offset_bits[out_bit]
-            for in_bit, coeff in enumerate(row):
-                if coeff == 1:
-                    bit_val ^= (x >> in_bit) & 1
-            if bit_val:
-                out |= 1 << out_bit
+        out = self._offset_mask
+        for out_bit, mask in enumerate(self._row_masks):
+            out ^= ((x & mask).bit_count() & 1) << out_bit
         return out
 
     def to_lookup_table(self) -> LookupTableForm:
-        table = {x: self.evaluate(x) for x in range(1 << self.n_input_bits)}
+        # Evaluate every input at once: y = A x xor b as one GF(2) matmul over the bit matrix.
+        # uint8 wraparound is harmless because only the parity of each dot product is kept.
+        a = np.array(self.matrix, dtype=np.uint8).reshape(self.n_output_bits, self.n_input_bits)
+        b = np.array(self.offset_bits, dtype=np.uint8)
+        xs = np.arange(1 << self.n_input_bits, dtype=np.uint64)
+        in_shifts = np.arange(self.n_input_bits, dtype=np.uint64)
+        x_bits = ((xs[:, None] >> in_shifts) & 1).astype(np.uint8)
+        y_bits = ((x_bits @ a.T) ^ b) & 1
+        ys = (y_bits.astype(np.uint64) << np.arange(self.n_output_bits, dtype=np.uint64)).sum(
+            axis=1, dtype=np.uint64
+        )
+        table = dict(zip(xs.tolist(), ys.tolist()))
         return LookupTableForm(
             n_input_bits=self.n_input_bits,
             n_output_bits=self.n_output_bits,
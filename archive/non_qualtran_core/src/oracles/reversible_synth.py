@@ -2,6 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+import numpy as np
+
+try:  # optional dependency: numba
+    from numba import njit
+except ImportError:  # the NumPy fallback below is used instead
+    njit = None
+
 from .function_ir import AffineXorForm, CompilableFunctionForm, LookupTableForm, SynthConfig
 
 
@@ -33,17 +40,151 @@ class GateCost:
         )
 
 
-@dataclass
+_GATE_NAMES = ("x", "cx", "mcx")
+_GATE_CODES = {name: code for code, name in enumerate(_GATE_NAMES)}
+_MCX = _GATE_CODES["mcx"]
+
+
+def _grown(buf: np.ndarray, min_size: int) -> np.ndarray:
+    out = np.empty(max(2 * len(buf), min_size), dtype=buf.dtype)
+    out[: len(buf)] = buf
+    return out
+
+
+@dataclass(eq=False)
 class ReversibleCircuit:
-    """Reversible map implementing |x>|0> -> |x>|f(x)| over packed bit registers."""
+    """Reversible map implementing |x>|0> -> |x>|f(x)| over packed bit registers.
+
+    Operations are stored as parallel arrays: ``gate_codes`` (indices into
+    ``("x", "cx", "mcx")``) and ``targets`` per op, with the ragged controls in CSR form
+    (``controls_indptr``, ``controls_data``, ``control_values_data``). ``operations``
+    rebuilds ``ReversibleOp`` records on demand.
+    """
 
     n_input_bits: int
     n_output_bits: int
-    operations: list[ReversibleOp] = field(default_factory=list)
     metadata: dict[str, object] = field(default_factory=dict)
+    _n_ops: int = field(init=False, repr=False, default=0)
+    _gate_codes: np.ndarray = field(init=False, repr=False)
+    _targets: np.ndarray = field(init=False, repr=False)
+    _indptr: np.ndarray = field(init=False, repr=False)
+    _controls: np.ndarray = field(init=False, repr=False)
+    _control_values: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._gate_codes = np.empty(16, dtype=np.uint8)
+        self._targets = np.empty(16, dtype=np.int32)
+        self._indptr = np.zeros(17, dtype=np.int64)
+        self._controls = np.empty(16, dtype=np.int32)
+        self._control_values = np.empty(16, dtype=np.uint8)
 
     def append(self, op: ReversibleOp) -> None:
-        self.operations.append(op)
+        code = _GATE_CODES.get(op.gate)
+        if code is None:
+            raise ValueError(f"Unsupported gate type: {op.gate}")
+        self._append(code, op.target, op.controls, op.control_values)
+
+    def _append(
+        self,
+        code: int,
+        target: int,
+        controls: tuple[int, ...],
+        control_values: tuple[int, ...],
+    ) -> None:
+        n = self._n_ops
+        start = int(self._indptr[n])
+        stop = start + len(controls)
+        if n == len(self._gate_codes):
+            self._gate_codes = _grown(self._gate_codes, n + 1)
+            self._targets = _grown(self._targets, n + 1)
+            self._indptr = _grown(self._indptr, n + 2)
+        if stop > len(self._controls):
+            self._controls = _grown(self._controls, stop)
+            self._control_values = _grown(self._control_values, stop)
+        self._gate_codes[n] = code
+        self._targets[n] = target
+        self._controls[start:stop] = controls
+        self._control_values[start:stop] = control_values
+        self._indptr[n + 1] = stop
+        self._n_ops = n + 1
+
+    def _extend(
+        self,
+        codes: np.ndarray,
+        targets: np.ndarray,
+        n_controls: np.ndarray,
+        controls: np.ndarray,
+        control_values: np.ndarray,
+    ) -> None:
+        """Append a block of ops given as arrays; ``n_controls`` is the per-op CSR row length."""
+        n = self._n_ops
+        n_new = len(codes)
+        start = int(self._indptr[n])
+        stop = start + len(controls)
+        if n + n_new > len(self._gate_codes):
+            self._gate_codes = _grown(self._gate_codes, n + n_new)
+            self._targets = _grown(self._targets, n + n_new)
+            self._indptr = _grown(self._indptr, n + n_new + 1)
+        if stop > len(self._controls):
+            self._controls = _grown(self._controls, stop)
+            self._control_values = _grown(self._control_values, stop)
+        self._gate_codes[n : n + n_new] = codes
+        self._targets[n : n + n_new] = targets
+        self._indptr[n + 1 : n + n_new + 1] = start + np.cumsum(n_controls)
+        self._controls[start:stop] = controls
+        self._control_values[start:stop] = control_values
+        self._n_ops = n + n_new
+
+    @property
+    def gate_codes(self) -> np.ndarray:
+        return self._gate_codes[: self._n_ops]
+
+    @property
+    def targets(self) -> np.ndarray:
+        return self._targets[: self._n_ops]
+
+    @property
+    def controls_indptr(self) -> np.ndarray:
+        return self._indptr[: self._n_ops + 1]
+
+    @property
+    def controls_data(self) -> np.ndarray:
+        return self._controls[: self._indptr[self._n_ops]]
+
+    @property
+    def control_values_data(self) -> np.ndarray:
+        return self._control_values[: self._indptr[self._n_ops]]
+
+    @property
+    def operations(self) -> list[ReversibleOp]:
+        indptr = self.controls_indptr.tolist()
+        controls = self.controls_data.tolist()
+        values = self.control_values_data.tolist()
+        return [
+            ReversibleOp(
+                gate=_GATE_NAMES[code],
+                controls=tuple(controls[indptr[i] : indptr[i + 1]]),
+                control_values=tuple(values[indptr[i] : indptr[i + 1]]),
+                target=target,
+            )
+            for i, (code, target) in enumerate(
+                zip(self.gate_codes.tolist(), self.targets.tolist())
+            )
+        ]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ReversibleCircuit):
+            return NotImplemented
+        return (
+            self.n_input_bits == other.n_input_bits
+            and self.n_output_bits == other.n_output_bits
+            and self.metadata == other.metadata
+            and np.array_equal(self.gate_codes, other.gate_codes)
+            and np.array_equal(self.targets, other.targets)
+            and np.array_equal(self.controls_indptr, other.controls_indptr)
+            and np.array_equal(self.controls_data, other.controls_data)
+            and np.array_equal(self.control_values_data, other.control_values_data)
+        )
 
     @property
     def n_qubits(self) -> int:
@@ -54,32 +195,66 @@ class ReversibleCircuit:
         return self.n_input_bits
 
     def estimate_cost(self) -> GateCost:
-        total = GateCost()
-        for op in self.operations:
-            if op.gate == "x":
-                total = total + GateCost(x_count=1)
-            elif op.gate == "cx":
-                total = total + GateCost(cnot_count=1)
-            elif op.gate == "mcx":
-                k = len(op.controls)
-                toffoli = _estimate_mcx_toffoli(k)
-                total = total + GateCost(
-                    toffoli_count=toffoli,
-                    t_count=7 * toffoli,
-                    t_depth_estimate=max(1, 3 * toffoli),
-                    ancilla_peak_estimate=max(0, k - 2),
-                )
-            else:
-                raise ValueError(f"Unsupported gate type in estimator: {op.gate}")
-        return total
-
-
-def _estimate_mcx_toffoli(n_controls: int) -> int:
-    if n_controls <= 1:
-        return 0
-    if n_controls == 2:
-        return 1
-    return 2 * n_controls - 3
+        codes = self.gate_codes
+        counts = np.bincount(codes, minlength=len(_GATE_NAMES))
+        n_controls = np.diff(self.controls_indptr)[codes == _MCX]
+        toffoli = _estimate_mcx_toffoli(n_controls)
+        toffoli_total = int(toffoli.sum())
+        return GateCost(
+            x_count=int(counts[_GATE_CODES["x"]]),
+            cnot_count=int(counts[_GATE_CODES["cx"]]),
+            toffoli_count=toffoli_total,
+            t_count=7 * toffoli_total,
+            t_depth_estimate=int(np.maximum(1, 3 * toffoli).sum()),
+            ancilla_peak_estimate=int(np.maximum(0, n_controls - 2).max(initial=0)),
+        )
+
+
+def _estimate_mcx_toffoli(n_controls: np.ndarray) -> np.ndarray:
+    """Toffoli count per MCX: 0 for <=1 control, 1 for 2, else 2k - 3; elementwise."""
+    k = np.asarray(n_controls, dtype=np.int64)
+    return np.where(k <= 1, 0, np.where(k == 2, 1, 2 * k - 3))
+
+
+def _minterm_zero_masks_loop(
+    xs: np.ndarray, ys: np.ndarray, n_inputs: int, n_outputs: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Per (out_bit, minterm) pair, the out bit and the mask of input wires that are 0.
+
+    Pairs are grouped by out bit, minterms in table order. Written as plain loops over
+    uint64 arrays so numba can compile it.
+    """
+    one = np.uint64(1)
+    full = (one << np.uint64(n_inputs)) - one
+    count = 0
+    for i in range(ys.shape[0]):
+        for out_bit in range(n_outputs):
+            if (ys[i] >> np.uint64(out_bit)) & one:
+                count += 1
+    out_bits = np.empty(count, dtype=np.int64)
+    zero_masks = np.empty(count, dtype=np.uint64)
+    k = 0
+    for out_bit in range(n_outputs):
+        for i in range(xs.shape[0]):
+            if (ys[i] >> np.uint64(out_bit)) & one:
+                out_bits[k] = out_bit
+                zero_masks[k] = ~xs[i] & full
+                k += 1
+    return out_bits, zero_masks
+
+
+def _minterm_zero_masks_numpy(
+    xs: np.ndarray, ys: np.ndarray, n_inputs: int, n_outputs: int
+) -> tuple[np.ndarray, np.ndarray]:
+    full = np.uint64((1 << n_inputs) - 1)
+    hits = ((ys[None, :] >> np.arange(n_outputs, dtype=np.uint64)[:, None]) & 1).astype(bool)
+    out_bits, idx = np.nonzero(hits)
+    return out_bits.astype(np.int64), ~xs[idx] & full
+
+
+_minterm_zero_masks = (
+    njit(cache=True)(_minterm_zero_masks_loop) if njit is not None else _minterm_zero_masks_numpy
+)
 
 
 def compile_lookup_table(form: LookupTableForm) -> ReversibleCircuit:
@@ -96,44 +271,37 @@ def compile_lookup_table(form: LookupTableForm) -> ReversibleCircuit:
     n_inputs = form.n_input_bits
     output_offset = circ.output_offset
 
-    for out_bit in range(form.n_output_bits):
-        target = output_offset + out_bit
-        minterms = [x for x, y in form.table.items() if ((y >> out_bit) & 1) == 1]
-        for x in minterms:
-            zero_control_wires: list[int] = []
-            controls: list[int] = []
-            control_values: list[int] = []
-            for in_bit in range(n_inputs):
-                bit_val = (x >> in_bit) & 1
-                controls.append(in_bit)
-                control_values.append(1)
-                if bit_val == 0:
-                    zero_control_wires.append(in_bit)
-
-            for wire in zero_control_wires:
-                circ.append(ReversibleOp(gate="x", target=wire))
-            if len(controls) == 0:
-                circ.append(ReversibleOp(gate="x", target=target))
-            elif len(controls) == 1:
-                circ.append(
-                    ReversibleOp(
-                        gate="cx",
-                        controls=(controls[0],),
-                        control_values=(1,),
-                        target=target,
-                    )
-                )
-            else:
-                circ.append(
-                    ReversibleOp(
-                        gate="mcx",
-                        controls=tuple(controls),
-                        control_values=tuple(control_values),
-                        target=target,
-                    )
-                )
-            for wire in reversed(zero_control_wires):
-                circ.append(ReversibleOp(gate="x", target=wire))
+    # Minterm extraction runs in a (numba-compiled when available) kernel.
+    xs = np.fromiter(form.table.keys(), dtype=np.uint64, count=len(form.table))
+    ys = np.fromiter(form.table.values(), dtype=np.uint64, count=len(form.table))
+    out_bits, zero_masks = _minterm_zero_masks(xs, ys, n_inputs, form.n_output_bits)
+
+    # Every minterm expands to the same template: X on its zero wires (ascending), the
+    # all-inputs controlled flip, then X on the zero wires again (descending). Lay the
+    # template out as 2 n + 1 slots per minterm and keep the slots that apply, so the
+    # whole op stream is built with array operations.
+    wires = np.arange(n_inputs, dtype=np.uint64)
+    zero = ((zero_masks[:, None] >> wires) & 1).astype(bool)  # (n_minterms, n_inputs)
+    n_minterms = len(out_bits)
+    keep = np.concatenate([zero, np.ones((n_minterms, 1), dtype=bool), zero[:, ::-1]], axis=1)
+    slot_targets = np.empty((n_minterms, 2 * n_inputs + 1), dtype=np.int64)
+    slot_targets[:, :n_inputs] = np.arange(n_inputs)
+    slot_targets[:, n_inputs] = output_offset + out_bits
+    slot_targets[:, n_inputs + 1 :] = np.arange(n_inputs)[::-1]
+    main_code = min(n_inputs, _MCX)  # x / cx / mcx for 0 / 1 / 2+ controls
+    slot_codes = np.zeros(2 * n_inputs + 1, dtype=np.uint8)
+    slot_codes[n_inputs] = main_code
+    slot_n_controls = np.zeros(2 * n_inputs + 1, dtype=np.int64)
+    slot_n_controls[n_inputs] = n_inputs
+
+    slots = np.nonzero(keep)[1]
+    circ._extend(
+        codes=slot_codes[slots],
+        targets=slot_targets[keep],
+        n_controls=slot_n_controls[slots],
+        controls=np.tile(np.arange(n_inputs, dtype=np.int32), n_minterms),
+        control_values=np.ones(n_minterms * n_inputs, dtype=np.uint8),
+    )
 
     circ.metadata["source"] = form.name
     circ.metadata["method"] = "sum_of_minterms"
@@ -147,20 +315,18 @@ def compile_affine_xor(form: AffineXorForm) -> ReversibleCircuit:
     circ = ReversibleCircuit(n_input_bits=form.n_input_bits, n_output_bits=form.n_output_bits)
     output_offset = circ.output_offset
 
-    for out_bit, row in enumerate(form.matrix):
+    x_code = _GATE_CODES["x"]
+    cx_code = _GATE_CODES["cx"]
+    one = (1,)
+    for out_bit, row_mask in enumerate(form.row_masks):
         target = output_offset + out_bit
         if form.offset_bits[out_bit] == 1:
-            circ.append(ReversibleOp(gate="x", target=target))
-        for in_bit, coeff in enumerate(row):
-            if coeff == 1:
-                circ.append(
-                    ReversibleOp(
-                        gate="cx",
-                        controls=(in_bit,),
-                        control_values=(1,),
-                        target=target,
-                    )
-                )
+            circ._append(x_code, target, (), ())
+        # Walk only the set bits of the packed row, lowest first, instead of every column.
+        while row_mask:
+            low = row_mask & -row_mask
+            circ._append(cx_code, target, (low.bit_length() - 1,), one)
+            row_mask ^= low
     circ.metadata["source"] = form.name
     circ.metadata["method"] = "affine_xor"
     return circ
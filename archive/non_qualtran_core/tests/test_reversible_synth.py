@@ -1,6 +1,15 @@
+import numpy as np
+import pytest
+
 from block_encoding.sparse_matrix import RowAccessOracle
 from oracles.function_ir import AffineXorForm, CompilableFunctionForm, LookupTableForm
-from oracles.reversible_synth import compile_function_form
+from oracles.reversible_synth import (
+    ReversibleCircuit,
+    ReversibleOp,
+    _minterm_zero_masks_loop,
+    _minterm_zero_masks_numpy,
+    compile_function_form,
+)
 
 
 def test_compile_affine_xor_has_no_t_cost():
@@ -11,6 +20,8 @@ def test_compile_affine_xor_has_no_t_cost():
         offset_bits=(0, 1),
         name="affine_test",
     )
+    assert form.row_masks == (0b101, 0b010)
+    assert form.offset_mask == 0b10
     circ = compile_function_form(form)
     cost = circ.estimate_cost()
     assert cost.t_count == 0
@@ -57,3 +68,50 @@ def test_callable_form_respects_output_range():
     )
     circ = compile_function_form(form)
     assert len(circ.operations) > 0
+
+
+def test_circuit_stores_ops_as_arrays():
+    circ = ReversibleCircuit(n_input_bits=3, n_output_bits=1)
+    ops = [
+        ReversibleOp(gate="x", target=0),
+        ReversibleOp(gate="mcx", controls=(0, 1, 2), control_values=(1, 1, 1), target=3),
+        ReversibleOp(gate="cx", controls=(1,), control_values=(1,), target=3),
+    ] * 10
+    for op in ops:
+        circ.append(op)
+
+    assert circ.operations == ops
+    assert circ.gate_codes.tolist()[:3] == [0, 2, 1]
+    assert circ.controls_indptr.tolist()[:4] == [0, 0, 3, 4]
+    cost = circ.estimate_cost()
+    assert (cost.x_count, cost.cnot_count, cost.toffoli_count) == (10, 10, 30)
+    assert cost.ancilla_peak_estimate == 1
+    with pytest.raises(ValueError):
+        circ.append(ReversibleOp(gate="swap", target=0))
+
+
+def test_minterm_kernel_loop_matches_numpy_fallback():
+    # Run the numba kernel's Python source directly so it is covered without numba.
+    rng = np.random.default_rng(7)
+    xs = rng.permutation(32)[:20].astype(np.uint64)
+    ys = rng.integers(0, 8, size=20).astype(np.uint64)
+
+    loop_bits, loop_masks = _minterm_zero_masks_loop(xs, ys, 5, 3)
+    np_bits, np_masks = _minterm_zero_masks_numpy(xs, ys, 5, 3)
+
+    assert np.array_equal(loop_bits, np_bits)
+    assert np.array_equal(loop_masks, np_masks)
+
+
+@pytest.mark.parametrize("n_inputs", [1, 4, 8])
+def test_minterm_kernel_numba_matches_numpy_fallback(n_inputs):
+    numba = pytest.importorskip("numba")
+    rng = np.random.default_rng(n_inputs)
+    xs = rng.permutation(1 << n_inputs).astype(np.uint64)
+    ys = rng.integers(0, 8, size=xs.size).astype(np.uint64)
+
+    jit_bits, jit_masks = numba.njit(_minterm_zero_masks_loop)(xs, ys, n_inputs, 3)
+    np_bits, np_masks = _minterm_zero_masks_numpy(xs, ys, n_inputs, 3)
+
+    assert np.array_equal(jit_bits, np_bits)
+    assert np.array_equal(jit_masks, np_masks)
@@ -1,8 +1,14 @@
+from dataclasses import replace
 from math import isclose, pi
 
+import numpy as np
+import pytest
+
 from block_encoding.base import BlockEncodingQuery
 from block_encoding.sparse_matrix import (
     EntryBinaryOracle,
+    LazyEntryBinaryOracle,
+    RowAccessOracle,
     SparseMatrixBlockEncoding,
     SparseOracleBundle,
 )
@@ -30,6 +36,11 @@ def test_row_col_oracles_compile_from_functions():
     assert bundle.col_oracle.lookup(1, 1) == 0
     compiled = bundle.row_oracle.compile_truth_table()
     assert len(compiled) == 6
+    assert compiled["101"] == "00"
+
+    lut = bundle.row_oracle.to_lookup_table()
+    assert (lut.n_input_bits, lut.n_output_bits) == (3, 2)
+    assert lut.table[(2 << 1) | 1] == 0
 
 
 def test_entry_oracle_full_data_loading_and_amplitude():
@@ -75,8 +86,258 @@ def test_sparse_block_encoding_query_payload():
     )
     encoding = SparseMatrixBlockEncoding(bundle=bundle)
 
-    payload = encoding.query(BlockEncodingQuery(step=3, parameters={"row": 1, "l_pos": 1}))
-    assert payload["op"] == "sparse_block_encoding_query"
-    assert payload["row"] == 1
-    assert payload["col"] == 1
-    assert isclose(payload["value"], 0.5, rel_tol=0, abs_tol=1e-9)
+    payload = encoding.query(BlockEncodingQuery.of(step=3, row=1, l_pos=1))
+    legacy = BlockEncodingQuery(step=3, parameters={"row": 1, "l_pos": 1})
+    assert legacy == BlockEncodingQuery.of(step=3, row=1, l_pos=1)
+    assert encoding.query(legacy) == payload
+    assert payload.op == "sparse_block_encoding_query"
+    assert payload.row == 1
+    assert payload.col == 1
+    assert isclose(payload.value, 0.5, rel_tol=0, abs_tol=1e-9)
+
+
+def test_entry_oracle_vectorized_matches_scalar_encoding():
+    matrix = [
+        [0.5, -0.25, 0.0],
+        [-0.125, 0.75, -1.0],
+    ]
+    scalar = EntryBinaryOracle.from_function(
+        n_rows=2,
+        n_cols=3,
+        value_bits=10,
+        frac_bits=8,
+        entry_fn=lambda i, j: matrix[i][j],
+    )
+    vectorized = EntryBinaryOracle.from_function(
+        n_rows=2,
+        n_cols=3,
+        value_bits=10,
+        frac_bits=8,
+        entry_fn=lambda i, j: np.array(matrix)[i, j],
+        vectorized=True,
+    )
+
+    assert vectorized.table.dtype == np.uint16
+    assert np.array_equal(vectorized.table, scalar.table)
+    assert vectorized.compile_truth_table() == scalar.compile_truth_table()
+    assert scalar.lookup_bits(1, 2) == "1100000000"
+    assert np.allclose(vectorized.to_dense(), matrix)
+
+    keys, values = vectorized.compile_truth_table_packed()
+    assert keys.tolist() == [0, 1, 2, 4, 5, 6]
+    assert values.tolist() == vectorized.table.reshape(-1).tolist()
+
+    with pytest.raises(ValueError):
+        EntryBinaryOracle.from_dense_numpy(np.array([[4.0]]), value_bits=10, frac_bits=8)
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf"), 1e19, 2.0**63])
+def test_entry_oracle_rejects_unencodable_values(value):
+    with pytest.raises(ValueError):
+        EntryBinaryOracle.from_dense_numpy(np.array([[value]]), value_bits=64, frac_bits=0)
+
+
+def test_entry_oracle_64_bit_words_round_trip_at_the_boundary():
+    extremes = np.array([[-(2.0**63), 2.0**62, -1.0]])
+    oracle = EntryBinaryOracle.from_dense_numpy(extremes, value_bits=64, frac_bits=0)
+
+    assert oracle.table.dtype == np.uint64
+    assert np.array_equal(oracle.to_dense(), extremes)
+    assert oracle.lookup_bits(0, 0) == "1" + "0" * 63
+    with pytest.raises(ValueError, match="total_bits"):
+        EntryBinaryOracle.from_dense_numpy(np.array([[1.0]]), value_bits=65, frac_bits=0)
+
+
+def test_sparse_block_encoding_reuses_cached_queries():
+    bundle = SparseOracleBundle.from_functions(
+        n_rows=2,
+        n_cols=2,
+        max_row_nnz=2,
+        max_col_nnz=2,
+        row_to_col_fn=lambda row, l_pos: l_pos,
+        col_to_row_fn=lambda col, l_pos: l_pos,
+        entry_fn=lambda i, j: -0.25 if i != j else 0.5,
+        value_bits=10,
+        frac_bits=8,
+        alpha=1.0,
+    )
+    encoding = SparseMatrixBlockEncoding(bundle=bundle)
+    request = BlockEncodingQuery.of(step=0, row=0, l_pos=1)
+
+    first = encoding.query(request)
+    adjoint = encoding.adjoint_query(request)
+
+    assert encoding.query(BlockEncodingQuery.of(step=7, row=0, l_pos=1)) == replace(first, step=7)
+    assert encoding._resolve.cache_info().hits == 2
+    assert adjoint.op == "sparse_block_encoding_query_dagger"
+    assert replace(adjoint, is_adjoint=False) == first
+    assert isclose(adjoint.phase, pi, rel_tol=0, abs_tol=1e-12)
+
+    requests = [BlockEncodingQuery.of(step=s, row=s % 2, l_pos=1 - s % 2) for s in range(4)]
+    assert encoding.query_batch(requests) == [encoding.query(r) for r in requests]
+
+
+def test_row_oracle_from_array_matches_function_and_checks_bounds():
+    from_fn = RowAccessOracle.from_function(
+        n_rows=4, n_cols=4, max_row_nnz=2, row_to_col_fn=lambda r, l: (r + l) % 4
+    )
+    from_array = RowAccessOracle.from_array(
+        n_rows=4, n_cols=4, table=np.array([[0, 1], [1, 2], [2, 3], [3, 0]])
+    )
+
+    assert from_fn.table.dtype == np.int32
+    assert np.array_equal(from_fn.table, from_array.table)
+    assert from_array.max_row_nnz == 2
+
+    with pytest.raises(ValueError):
+        RowAccessOracle.from_function(
+            n_rows=2, n_cols=2, max_row_nnz=2, row_to_col_fn=lambda r, l: r + l
+        )
+
+
+def test_from_function_accepts_scalar_only_callables():
+    calls: list[tuple[int, int]] = []
+
+    def entry_fn(i: int, j: int) -> float:
+        calls.append((i, j))
+        return 0.5 if i == j else 0.0
+
+    row_to_col = lambda r, l: (r + l).bit_length() % 4
+    row_oracle = RowAccessOracle.from_function(
+        n_rows=4, n_cols=4, max_row_nnz=2, row_to_col_fn=row_to_col
+    )
+    entry_oracle = EntryBinaryOracle.from_function(
+        n_rows=2, n_cols=2, value_bits=10, frac_bits=8, entry_fn=entry_fn
+    )
+
+    assert row_oracle.table.tolist() == [[0, 1], [1, 2], [2, 2], [2, 3]]
+    assert calls == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    assert entry_oracle.lookup_value(1, 1) == 0.5
+
+    vectorized = RowAccessOracle.from_function(
+        n_rows=4, n_cols=4, max_row_nnz=2, row_to_col_fn=lambda r, l: (r + l) % 4, vectorized=True
+    )
+    assert np.array_equal(vectorized.table, [[0, 1], [1, 2], [2, 3], [3, 0]])
+    with pytest.raises(TypeError):
+        RowAccessOracle.from_function(
+            n_rows=2, n_cols=2, max_row_nnz=2, row_to_col_fn=lambda r, l: r / 2, vectorized=True
+        )
+
+
+def test_oracles_compare_by_table_and_reject_out_of_range_indices():
+    kwargs = dict(
+        n_rows=2,
+        n_cols=2,
+        max_row_nnz=2,
+        max_col_nnz=2,
+        row_to_col_fn=lambda r, l: l,
+        col_to_row_fn=lambda c, l: l,
+        entry_fn=lambda i, j: 0.5 if i == j else -0.25,
+        value_bits=10,
+        frac_bits=8,
+        alpha=1.0,
+    )
+    bundle = SparseOracleBundle.from_functions(**kwargs)
+
+    assert bundle == SparseOracleBundle.from_functions(**kwargs)
+    assert bundle != SparseOracleBundle.from_functions(**{**kwargs, "entry_fn": lambda i, j: 0.0})
+    assert bundle.row_oracle != bundle.col_oracle
+
+    encoding = SparseMatrixBlockEncoding(bundle=bundle)
+    for lookup in (
+        lambda: bundle.row_oracle.lookup(-1, 0),
+        lambda: bundle.col_oracle.lookup(0, 2),
+        lambda: bundle.amplitude_oracle.entry_oracle.lookup_bits(0, -1),
+        lambda: bundle.amplitude_oracle.encode(-1, -1),
+        lambda: encoding.query(BlockEncodingQuery.of(step=0, row=-1, l_pos=0)),
+        lambda: encoding.query_batch([BlockEncodingQuery.of(step=0, row=0, l_pos=-1)]),
+    ):
+        with pytest.raises(KeyError):
+            lookup()
+
+
+def test_row_oracle_padding_sentinels():
+    # Row 1 has a single nonzero; its second slot holds the sentinel l_pos + n_cols.
+    def row_to_col(r: int, l: int) -> int:
+        return l if r == 0 else (1 if l == 0 else l + 2)
+
+    row_oracle = RowAccessOracle.from_function(
+        n_rows=2, n_cols=2, max_row_nnz=2, row_to_col_fn=row_to_col
+    )
+
+    assert row_oracle.row_nnz.tolist() == [2, 1]
+    assert row_oracle.lookup(1, 1) == 3
+    assert len(row_oracle.compile_truth_table()) == 3
+    assert row_oracle.to_lookup_table().n_output_bits == 2
+
+    with pytest.raises(ValueError):
+        RowAccessOracle.from_array(n_rows=1, n_cols=2, table=np.array([[2, 1]]))
+
+    bundle = SparseOracleBundle.from_functions(
+        n_rows=2,
+        n_cols=2,
+        max_row_nnz=2,
+        max_col_nnz=2,
+        row_to_col_fn=row_to_col,
+        col_to_row_fn=lambda c, l: l,
+        entry_fn=lambda i, j: 0.5,
+        value_bits=10,
+        frac_bits=8,
+        alpha=1.0,
+    )
+    encoding = SparseMatrixBlockEncoding(bundle=bundle)
+    requests = [BlockEncodingQuery.of(step=0, row=1, l_pos=l) for l in range(2)]
+    ops = encoding.query_batch(requests)
+
+    assert ops == [encoding.query(r) for r in requests]
+    assert ops[1].col == 3
+    assert ops[1].theta == 0.0
+
+
+def test_lazy_entry_oracle_matches_dense_bundle():
+    calls: list[tuple[int, int]] = []
+
+    def entry_fn(i: int, j: int) -> float:
+        calls.append((i, j))
+        return 0.5 if i == j else -0.25
+
+    kwargs = dict(
+        n_rows=2,
+        n_cols=2,
+        max_row_nnz=2,
+        max_col_nnz=2,
+        row_to_col_fn=lambda r, l: l,
+        col_to_row_fn=lambda c, l: l,
+        value_bits=10,
+        frac_bits=8,
+        alpha=1.0,
+    )
+    lazy = SparseOracleBundle.from_functions(entry_fn=entry_fn, lazy=True, **kwargs)
+    dense = SparseOracleBundle.from_functions(
+        entry_fn=lambda i, j: 0.5 if i == j else -0.25, **kwargs
+    )
+    lazy_entry = lazy.amplitude_oracle.entry_oracle
+
+    assert isinstance(lazy_entry, LazyEntryBinaryOracle)
+    assert calls == []
+    assert lazy_entry.lookup_bits(0, 1) == dense.amplitude_oracle.entry_oracle.lookup_bits(0, 1)
+    assert lazy_entry.lookup_value(0, 1) == -0.25
+    assert calls == [(0, 1)]
+    with pytest.raises(KeyError):
+        lazy_entry.lookup_value(2, 0)
+
+    requests = [BlockEncodingQuery.of(step=0, row=r, l_pos=l) for r in range(2) for l in range(2)]
+    lazy_ops = SparseMatrixBlockEncoding(bundle=lazy).query_batch(requests)
+    assert lazy_ops == SparseMatrixBlockEncoding(bundle=dense).query_batch(requests)
+
+    # Padding slots must not evaluate entry_fn.
+    padded = SparseOracleBundle.from_functions(
+        entry_fn=entry_fn,
+        lazy=True,
+        **{**kwargs, "row_to_col_fn": lambda r, l: l if r == 0 else (1 if l == 0 else l + 2)},
+    )
+    calls.clear()
+    ops = SparseMatrixBlockEncoding(bundle=padded).query_batch(requests)
+    assert calls == [(0, 0), (0, 1), (1, 1)]
+    assert ops[3].col == 3 and ops[3].value == 0.0
+    assert np.array_equal(lazy_entry.materialize().table, dense.amplitude_oracle.entry_oracle.table)
@@ -22,6 +22,7 @@ def main() -> None:
         epsilon_r=6.0,
         orbital_centers=data.orbital_centers,
         kappa=0.2,
+        layout="full",
     )
     print("n_lmo =", data.lmo_coeff.shape[1])
     print("hcore_lmo shape =", data.hcore_lmo.shape)
@@ -8,6 +8,7 @@ from .pyscf_adapter import (
     compute_orbital_centers,
     compute_static_screened_coulomb_lmo,
     compute_two_electron_integrals_lmo,
+    eri_full,
     localize_orbitals,
     run_scf,
 )
@@ -22,4 +23,5 @@ __all__ = [
     "compute_two_electron_integrals_lmo",
     "compute_orbital_centers",
     "compute_static_screened_coulomb_lmo",
+    "eri_full",
 ]
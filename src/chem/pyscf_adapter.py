@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+import math
+import warnings
 from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
+from numpy.typing import DTypeLike
+
+try:  # optional dependency: scipy (installed with the [chem] extra)
+    from scipy.spatial import cKDTree
+    from scipy.spatial.distance import pdist, squareform
+except ImportError:  # core installs fall back to dense NumPy distance computations
+    cKDTree = pdist = squareform = None
 
 
 @dataclass
 class LMOData:
-    """Container for localized orbital quantities required by exciton builders."""
+    """Container for localized orbital quantities required by exciton builders.
+
+    ``eri_lmo`` is stored in PySCF's 4-fold packed chemist layout with shape
+    ``(n_pair, n_pair)``, ``n_pair = n_orb (n_orb + 1) / 2``; use ``eri_full`` to expand.
+    ``dtype`` is the storage precision of the integral and center arrays; orbital
+    coefficients always stay float64.
+    """
 
     mo_coeff: np.ndarray
     lmo_coeff: np.ndarray
@@ -18,6 +33,7 @@ class LMOData:
     orbital_centers: np.ndarray
     occupied: tuple[int, ...]
     virtual: tuple[int, ...]
+    dtype: DTypeLike = np.float64
 
 
 class PySCFExcitonDataBuilder:
@@ -37,17 +53,30 @@ class PySCFExcitonDataBuilder:
         xc: str = "PBE",
         localization: str = "boys",
         conv_tol: float = 1e-9,
+        dtype: DTypeLike = np.float64,
+        localization_max_cycle: int = 200,
+        localization_conv_tol: float = 1e-7,
+        localization_stability: bool = True,
     ) -> LMOData:
+        """Run the full pipeline; pass ``dtype=np.float32`` to halve integral storage.
+
+        ``localization_*`` options are forwarded to ``localize_orbitals``.
+        """
         mf = run_scf(mol=mol, method=method, xc=xc, conv_tol=conv_tol)
         lmo_coeff, occupied, virtual = localize_orbitals(
             mol=mol,
             mo_coeff=mf.mo_coeff,
             mo_occ=mf.mo_occ,
             scheme=localization,
+            max_cycle=localization_max_cycle,
+            conv_tol=localization_conv_tol,
+            stability_check=localization_stability,
+        )
+        hcore_lmo, fock_lmo = compute_one_electron_integrals_lmo(
+            mf=mf, lmo_coeff=lmo_coeff, dtype=dtype
         )
-        hcore_lmo, fock_lmo = compute_one_electron_integrals_lmo(mf=mf, lmo_coeff=lmo_coeff)
-        eri_lmo = compute_two_electron_integrals_lmo(mol=mol, lmo_coeff=lmo_coeff)
-        orbital_centers = compute_orbital_centers(mol=mol, lmo_coeff=lmo_coeff)
+        eri_lmo = compute_two_electron_integrals_lmo(mol=mol, lmo_coeff=lmo_coeff, dtype=dtype)
+        orbital_centers = compute_orbital_centers(mol=mol, lmo_coeff=lmo_coeff, dtype=dtype)
         return LMOData(
             mo_coeff=np.asarray(mf.mo_coeff),
             lmo_coeff=lmo_coeff,
@@ -57,6 +86,7 @@ class PySCFExcitonDataBuilder:
             orbital_centers=orbital_centers,
             occupied=occupied,
             virtual=virtual,
+            dtype=dtype,
         )
 
 
@@ -118,47 +148,101 @@ def localize_orbitals(
     mo_coeff: np.ndarray,
     mo_occ: np.ndarray,
     scheme: str = "boys",
+    max_cycle: int = 200,
+    conv_tol: float = 1e-7,
+    stability_check: bool = True,
 ) -> tuple[np.ndarray, tuple[int, ...], tuple[int, ...]]:
-    """Localize occupied and virtual spaces separately and return full LMO coefficients."""
+    """Localize occupied and virtual spaces separately and return full LMO coefficients.
+
+    Both schemes use PySCF's second-order (CIAH) localizer with ``max_cycle`` and
+    ``conv_tol``. With ``stability_check``, Pipek-Mezey results are verified by Jacobi
+    sweeps and re-optimized from the rotated orbitals until stable.
+    """
     try:
         from pyscf import lo
     except ImportError as exc:  # pragma: no cover - depends on optional dependency
         raise ImportError("PySCF is required for localize_orbitals(). Install with [chem].") from exc
 
-    occ_idx = tuple(np.where(np.asarray(mo_occ) > 0)[0].tolist())
-    vir_idx = tuple(np.where(np.asarray(mo_occ) == 0)[0].tolist())
+    occ = np.asarray(mo_occ)
+    occ_idx = np.flatnonzero(occ > 0)
+    vir_idx = np.flatnonzero(occ == 0)
 
-    c_occ = np.asarray(mo_coeff)[:, occ_idx]
-    c_vir = np.asarray(mo_coeff)[:, vir_idx]
+    mo_coeff = np.asarray(mo_coeff)
+    c_occ = mo_coeff[:, occ_idx]
+    c_vir = mo_coeff[:, vir_idx]
 
     scheme_l = scheme.strip().lower()
     if scheme_l == "boys":
-        c_occ_loc = lo.Boys(mol, c_occ).kernel()
-        c_vir_loc = lo.Boys(mol, c_vir).kernel() if c_vir.shape[1] > 0 else c_vir
+        localizer_cls = lo.Boys
     elif scheme_l in ("pipek", "pipek-mezey", "pipek_mezey"):
-        c_occ_loc = lo.PM(mol, c_occ).kernel()
-        c_vir_loc = lo.PM(mol, c_vir).kernel() if c_vir.shape[1] > 0 else c_vir
+        localizer_cls = lo.PM
     else:
         raise ValueError(f"Unsupported localization scheme: {scheme}. Use boys or pipek-mezey.")
 
+    def localize(c: np.ndarray) -> np.ndarray:
+        if c.shape[1] == 0:
+            return c
+        return _run_localizer(localizer_cls(mol, c), max_cycle, conv_tol, stability_check)
+
+    c_occ_loc = localize(c_occ)
+    c_vir_loc = localize(c_vir)
+
     lmo_coeff = np.concatenate([c_occ_loc, c_vir_loc], axis=1)
-    occupied = tuple(range(len(occ_idx)))
-    virtual = tuple(range(len(occ_idx), len(occ_idx) + len(vir_idx)))
+    n_occ = occ_idx.size
+    occupied = tuple(range(n_occ))
+    virtual = tuple(range(n_occ, n_occ + vir_idx.size))
     return lmo_coeff, occupied, virtual
 
 
-def compute_one_electron_integrals_lmo(mf: Any, lmo_coeff: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    """Compute hcore and Fock matrices in the LMO basis."""
+_MAX_STABILITY_RESTARTS = 10
+
+
+def _run_localizer(
+    localizer: Any, max_cycle: int, conv_tol: float, stability_check: bool
+) -> np.ndarray:
+    localizer.max_cycle = max_cycle
+    localizer.conv_tol = conv_tol
+    mo = localizer.kernel()
+    # Jacobi sweeps (PySCF's PM localizer only) catch saddle points the CIAH solver stops on.
+    if stability_check and hasattr(localizer, "stability_jacobi"):
+        for _ in range(_MAX_STABILITY_RESTARTS):
+            mo, stable = localizer.stability_jacobi(return_status=True)
+            if stable:
+                break
+            mo = localizer.kernel(mo)
+        else:
+            warnings.warn(
+                f"Localization still unstable after {_MAX_STABILITY_RESTARTS} Jacobi restarts; "
+                "returning orbitals that may sit at a saddle point.",
+                RuntimeWarning,
+                stacklevel=4,
+            )
+    return mo
+
+
+def compute_one_electron_integrals_lmo(
+    mf: Any, lmo_coeff: np.ndarray, dtype: DTypeLike = np.float64
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute hcore and Fock matrices in the LMO basis, returned as ``dtype``."""
     c = np.asarray(lmo_coeff)
     h_ao = np.asarray(mf.get_hcore())
     f_ao = np.asarray(mf.get_fock())
-    h_lmo = c.T @ h_ao @ c
-    f_lmo = c.T @ f_ao @ c
-    return h_lmo, f_lmo
+    nao = h_ao.shape[-1]
+    # Transform hcore and every Fock component in one batched pair of GEMMs.
+    stacked = np.concatenate([h_ao[None], f_ao.reshape(-1, nao, nao)])
+    out = c.T @ (stacked @ c)
+    h_lmo = out[0]
+    f_lmo = out[1:].reshape(f_ao.shape[:-2] + out.shape[-2:])
+    return h_lmo.astype(dtype, copy=False), f_lmo.astype(dtype, copy=False)
 
 
-def compute_two_electron_integrals_lmo(mol: Any, lmo_coeff: np.ndarray) -> np.ndarray:
-    """Compute chemist-notation two-electron integrals (pq|rs) in LMO basis."""
+def compute_two_electron_integrals_lmo(
+    mol: Any, lmo_coeff: np.ndarray, dtype: DTypeLike = np.float64
+) -> np.ndarray:
+    """Compute chemist-notation two-electron integrals (pq|rs) in LMO basis.
+
+    The result keeps ao2mo's 4-fold packed ``(n_pair, n_pair)`` layout; see ``eri_full``.
+    """
     try:
         from pyscf import ao2mo
     except ImportError as exc:  # pragma: no cover - depends on optional dependency
@@ -167,22 +251,99 @@ def compute_two_electron_integrals_lmo(mol: Any, lmo_coeff: np.ndarray) -> np.nd
         ) from exc
 
     c = np.asarray(lmo_coeff)
-    n_orb = c.shape[1]
-    eri = ao2mo.kernel(mol, c, compact=False)
-    return np.asarray(eri).reshape(n_orb, n_orb, n_orb, n_orb)
+    return np.asarray(ao2mo.kernel(mol, c, compact=True)).astype(dtype, copy=False)
+
+
+def _triangular_root(m: int) -> int | None:
+    """``n`` with ``n (n + 1) / 2 == m``, or None if ``m`` is not triangular."""
+    root = math.isqrt(8 * m + 1)
+    return (root - 1) // 2 if root * root == 8 * m + 1 else None
+
+
+def _pair_index(n: int) -> np.ndarray:
+    """(n, n) map from (p, q) to the packed lower-triangle index of max(p,q), min(p,q)."""
+    idx = np.arange(n)
+    hi = np.maximum(idx[:, None], idx[None, :])
+    lo = np.minimum(idx[:, None], idx[None, :])
+    return hi * (hi + 1) // 2 + lo
 
 
-def compute_orbital_centers(mol: Any, lmo_coeff: np.ndarray) -> np.ndarray:
+def eri_full(eri_lmo: np.ndarray, n_orb: int | None = None) -> np.ndarray:
+    """Expand packed chemist-notation integrals to a full (n_orb, n_orb, n_orb, n_orb) tensor.
+
+    Accepts the 4-fold ``(n_pair, n_pair)`` layout, the 8-fold 1D layout, or an already
+    full tensor (returned unchanged). Equivalent to ``pyscf.ao2mo.restore(1, ...)``.
+    """
+    eri = np.asarray(eri_lmo)
+    if eri.ndim == 4:
+        n_full = eri.shape[0] if n_orb is None else n_orb
+        if eri.shape != (n_full,) * 4:
+            raise ValueError(f"Full ERI shape {eri.shape} is not ({n_full},) * 4.")
+        return eri
+    if eri.ndim == 2:
+        if eri.shape[0] != eri.shape[1]:
+            raise ValueError(f"4-fold packed ERI shape {eri.shape} is not square.")
+        n_pair = eri.shape[0]
+    elif eri.ndim == 1:
+        n_pair = _triangular_root(eri.shape[0])
+    else:
+        raise ValueError("eri_lmo must be a 4-fold (2D), 8-fold (1D) or full (4D) ERI array.")
+    if n_orb is None:
+        n_orb = _triangular_root(n_pair) if n_pair is not None else None
+    if n_orb is None or n_orb * (n_orb + 1) // 2 != n_pair:
+        raise ValueError(f"Packed ERI shape {eri.shape} does not match n_orb={n_orb}.")
+
+    if eri.ndim == 1:
+        # Unpack 8-fold to 4-fold first; a composed (n, n, n, n) index array would
+        # cost more memory than the result.
+        packed = np.empty((n_pair, n_pair), dtype=eri.dtype)
+        tril = np.tril_indices(n_pair)
+        packed[tril] = eri
+        packed[tril[::-1]] = eri
+        eri = packed
+    pair = _pair_index(n_orb)
+    return eri[pair[:, :, None, None], pair[None, None, :, :]]
+
+
+def compute_orbital_centers(
+    mol: Any, lmo_coeff: np.ndarray, dtype: DTypeLike = np.float64
+) -> np.ndarray:
     """Compute LMO charge-centroid approximations <phi_p|r|phi_p>."""
-    c = np.asarray(lmo_coeff)
-    n_orb = c.shape[1]
-    r_ints = np.asarray(mol.intor_symmetric("int1e_r", comp=3))  # (x,y,z, nao, nao)
-    centers = np.zeros((n_orb, 3), dtype=float)
-    for p in range(n_orb):
-        vec = c[:, p]
-        for xyz in range(3):
-            centers[p, xyz] = float(vec.T @ r_ints[xyz] @ vec)
-    return centers
+    c = np.ascontiguousarray(lmo_coeff, dtype=np.float64)
+    r_ints = np.ascontiguousarray(mol.intor_symmetric("int1e_r", comp=3), dtype=np.float64)
+    # centers[p, x] = c[:, p]^T r_ints[x] c[:, p]: one batched GEMM over the three
+    # contiguous components (no hidden copies), then a column-wise dot with c.
+    r_c = np.matmul(r_ints, c)  # (3, nao, n_orb)
+    centers = np.einsum("ap,xap->px", c, r_c)
+    return centers.astype(dtype, copy=False)
+
+
+def _pairwise_distances(centers: np.ndarray) -> np.ndarray:
+    """Euclidean distance matrix between rows of ``centers``."""
+    if pdist is None:
+        return np.linalg.norm(centers[:, None, :] - centers[None, :, :], axis=-1)
+    return squareform(pdist(centers))
+
+
+def _damping_neighbor_pairs(
+    centers: np.ndarray, kappa: float, tol: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Ordered (a, b) center pairs with exp(-kappa d_ab / 2) >= ``tol``, and those factors.
+
+    Includes the diagonal. Uses a k-d tree when SciPy is available.
+    """
+    r_cut = -2.0 * np.log(tol) / kappa
+    if cKDTree is None:
+        i, j = np.nonzero(np.triu(_pairwise_distances(centers) <= r_cut, k=1))
+    else:
+        pairs = cKDTree(centers).query_pairs(r_cut, output_type="ndarray")
+        i, j = pairs[:, 0], pairs[:, 1]
+    dist = np.linalg.norm(centers[i] - centers[j], axis=1)
+    diag = np.arange(centers.shape[0])
+    rows = np.concatenate([diag, i, j])
+    cols = np.concatenate([diag, j, i])
+    factors = np.exp(-0.5 * kappa * np.concatenate([np.zeros(diag.size), dist, dist]))
+    return rows, cols, factors
 
 
 def compute_static_screened_coulomb_lmo(
@@ -190,6 +351,11 @@ def compute_static_screened_coulomb_lmo(
     epsilon_r: float = 4.0,
     orbital_centers: np.ndarray | None = None,
     kappa: float | None = None,
+    dtype: DTypeLike | None = None,
+    out: np.ndarray | None = None,
+    inplace: bool = False,
+    damping_tol: float | None = None,
+    layout: str | None = None,
 ) -> np.ndarray:
     """Compute static screened Coulomb interaction W_pqrs from bare (pq|rs).
 
@@ -199,23 +365,92 @@ def compute_static_screened_coulomb_lmo(
     Optional distance damping:
     W_pqrs *= exp(-kappa * (d_pr + d_qs) / 2)
     where d_ab = |R_a - R_b| using LMO centers.
+
+    The result has the same layout as ``eri_lmo`` (packed or full, see ``eri_full``)
+    unless ``layout="full"`` asks for a full 4D tensor. Damping breaks the pq/rs
+    permutational symmetry, so packed input with ``kappa`` requires ``layout="full"``.
+
+    ``dtype`` sets the working and output precision (e.g. ``np.float32`` or
+    ``ml_dtypes.bfloat16``); by default floating inputs keep their own precision.
+
+    The result is written to ``out`` when given. ``inplace=True`` overwrites ``eri_lmo``
+    itself (it must already be an ndarray of the working dtype); packed input that has to
+    be expanded for damping is never modified.
+
+    With ``damping_tol``, damping factors below the tolerance are treated as zero: a
+    neighbor list on the centers (cutoff ``-2 ln(tol) / kappa``) selects the (p, r) and
+    (q, s) pairs that survive, and only those W_pqrs are computed; all others are 0.
     """
-    eri = np.asarray(eri_lmo, dtype=float)
-    if eri.ndim != 4:
-        raise ValueError("eri_lmo must have shape (n_orb, n_orb, n_orb, n_orb).")
+    eri = np.asarray(eri_lmo)
+    # Validate the layout before any cast so a bad input never costs a tensor-sized copy.
+    shape = eri.shape
+    if len(shape) == 1:
+        # 8-fold: n_pair (n_pair + 1) / 2 entries with n_pair = n_orb (n_orb + 1) / 2.
+        n_pair = _triangular_root(shape[0])
+        valid = n_pair is not None and _triangular_root(n_pair) is not None
+    elif len(shape) == 2:
+        valid = shape[0] == shape[1] and _triangular_root(shape[0]) is not None
+    else:
+        valid = len(shape) == 4 and len(set(shape)) == 1
+    if not valid:
+        raise ValueError(
+            f"eri_lmo shape {shape} is not 8-fold packed (1D), 4-fold packed "
+            "(n_pair, n_pair) or full (n_orb, n_orb, n_orb, n_orb)."
+        )
+    if layout not in (None, "full"):
+        raise ValueError(f"Unsupported layout {layout!r}; use None (same as input) or 'full'.")
+    if kappa is not None and eri.ndim != 4 and layout != "full":
+        raise ValueError("Damped W is not 4-fold symmetric; pass layout='full' for packed input.")
+    if dtype is None:
+        dtype = eri.dtype if np.issubdtype(eri.dtype, np.floating) else np.float64
+    if inplace and (out is not None or eri is not eri_lmo or eri.dtype != np.dtype(dtype)):
+        raise ValueError("inplace=True needs an ndarray of the working dtype and no out.")
+    # No-op for float64/float32 (or any input already in ``dtype``): the caller's buffer is used.
+    eri = eri.astype(dtype, copy=False)
     if epsilon_r <= 0:
         raise ValueError("epsilon_r must be > 0.")
 
-    screened = eri / float(epsilon_r)
-    if kappa is None:
+    centers = None
+    if kappa is not None:
+        if orbital_centers is None:
+            raise ValueError("orbital_centers must be provided when kappa is set.")
+        centers = np.asarray(orbital_centers, dtype=float)
+        if centers.ndim != 2 or centers.shape[1] != 3:
+            raise ValueError("orbital_centers must have shape (n_orb, 3).")
+    elif damping_tol is not None:
+        raise ValueError("damping_tol requires kappa.")
+    if layout == "full" and eri.ndim != 4:
+        # The expanded tensor is fresh scratch, so it can take the result directly.
+        eri = eri_full(eri, None if centers is None else centers.shape[0])
+        inplace = out is None
+
+    scale = eri.dtype.type(1.0 / float(epsilon_r))
+    if damping_tol is not None:
+        if not 0.0 < damping_tol < 1.0 or kappa <= 0:
+            raise ValueError("damping_tol must be in (0, 1) and kappa must be > 0.")
+        rows, cols, factors = _damping_neighbor_pairs(centers, float(kappa), damping_tol)
+        factors = factors.astype(eri.dtype)
+        # W[p, q, r, s] for (p, r) = pair i and (q, s) = pair j: an (m, m) block, m ~ n k.
+        idx = (rows[:, None], rows[None, :], cols[:, None], cols[None, :])
+        block = eri[idx] * scale
+        block *= factors[:, None]
+        block *= factors[None, :]
+        if out is None:
+            out = eri if inplace else np.empty_like(eri)
+        out.fill(0)
+        out[idx] = block
+        return out
+
+    # Multiply by the reciprocal into a preallocated target; no temporary from ``/``.
+    if out is None:
+        out = eri if inplace else np.empty_like(eri)
+    screened = np.multiply(eri, scale, out=out)
+    if centers is None:
         return screened
-    if orbital_centers is None:
-        raise ValueError("orbital_centers must be provided when kappa is set.")
-
-    centers = np.asarray(orbital_centers, dtype=float)
-    if centers.ndim != 2 or centers.shape[1] != 3:
-        raise ValueError("orbital_centers must have shape (n_orb, 3).")
 
-    dmat = np.linalg.norm(centers[:, None, :] - centers[None, :, :], axis=-1)
-    damping = np.exp(-float(kappa) * (dmat[:, None, :, None] + dmat[None, :, None, :]) / 2.0)
-    return screened * damping
+    dmat = _pairwise_distances(centers)
+    # exp(-kappa (d_pr + d_qs) / 2) factors into two (n, n) terms; no 4-index scratch.
+    damping = np.exp(dmat.astype(screened.dtype) * screened.dtype.type(-0.5 * float(kappa)))
+    screened *= damping[:, None, :, None]
+    screened *= damping[None, :, None, :]
+    return screened
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import numpy as np
+import pytest
 
-from chem.pyscf_adapter import compute_static_screened_coulomb_lmo
+from chem import pyscf_adapter
+from chem.pyscf_adapter import compute_static_screened_coulomb_lmo, eri_full
 
 
 def test_static_screening_scalar_epsilon():
@@ -20,3 +22,90 @@ def test_static_screening_with_distance_damping():
     )
     assert w.shape == (2, 2, 2, 2)
     assert w[0, 0, 1, 1] < w[0, 0, 0, 0]
+
+
+def test_packed_eri_expands_and_screens_like_full_tensor():
+    n = 3
+    rng = np.random.default_rng(0)
+    eri = rng.normal(size=(n, n, n, n))
+    eri = eri + eri.transpose(1, 0, 2, 3)
+    eri = eri + eri.transpose(0, 1, 3, 2)
+    eri = eri + eri.transpose(2, 3, 0, 1)
+    rows, cols = np.tril_indices(n)
+    packed = eri[rows, cols][:, rows, cols]
+    centers = rng.normal(size=(n, 3))
+
+    assert np.allclose(eri_full(packed), eri)
+    assert np.allclose(compute_static_screened_coulomb_lmo(packed, epsilon_r=2.0), packed / 2.0)
+    damped = dict(orbital_centers=centers, kappa=0.5)
+    assert np.allclose(
+        compute_static_screened_coulomb_lmo(packed, 2.0, layout="full", **damped),
+        compute_static_screened_coulomb_lmo(eri, 2.0, **damped),
+    )
+    assert np.allclose(compute_static_screened_coulomb_lmo(packed, 2.0, layout="full"), eri / 2.0)
+    with pytest.raises(ValueError, match="layout"):
+        compute_static_screened_coulomb_lmo(packed, 2.0, **damped)
+
+
+def test_static_screening_keeps_reduced_precision():
+    eri = np.ones((2, 2, 2, 2), dtype=np.float32)
+    centers = np.array([[0.0, 0.0, 0.0], [2.0, 0.0, 0.0]])
+    w = compute_static_screened_coulomb_lmo(eri, 2.0, orbital_centers=centers, kappa=0.5)
+    assert w.dtype == np.float32
+    assert compute_static_screened_coulomb_lmo(eri, 2.0, dtype=np.float64).dtype == np.float64
+    assert np.isclose(w[0, 0, 1, 1], 0.5 * np.exp(-1.0))
+
+
+def test_static_screening_out_and_inplace():
+    eri = np.full((2, 2, 2, 2), 2.0)
+    out = np.empty_like(eri)
+    w = compute_static_screened_coulomb_lmo(eri, epsilon_r=4.0, out=out)
+    assert w is out and np.allclose(out, 0.5) and np.allclose(eri, 2.0)
+
+    w = compute_static_screened_coulomb_lmo(eri, epsilon_r=4.0, inplace=True)
+    assert w is eri and np.allclose(eri, 0.5)
+
+
+def test_static_screening_neighbor_cutoff_matches_dense_damping():
+    rng = np.random.default_rng(1)
+    eri = rng.normal(size=(4, 4, 4, 4))
+    centers = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [30.0, 0.0, 0.0], [31.0, 0.0, 0.0]])
+    dense = compute_static_screened_coulomb_lmo(eri, 2.0, orbital_centers=centers, kappa=1.0)
+    cut = compute_static_screened_coulomb_lmo(
+        eri, 2.0, orbital_centers=centers, kappa=1.0, damping_tol=1e-6
+    )
+
+    near = np.abs(centers[:, None, 0] - centers[None, :, 0]) < 5.0
+    kept = near[:, None, :, None] & near[None, :, None, :]
+    assert np.allclose(cut[kept], dense[kept])
+    assert np.all(cut[~kept] == 0.0)
+    assert np.all(np.abs(dense[~kept]) < 1e-5)
+
+
+def test_static_screening_numpy_fallback_without_scipy(monkeypatch):
+    rng = np.random.default_rng(2)
+    eri = rng.normal(size=(4, 4, 4, 4))
+    centers = rng.normal(scale=3.0, size=(4, 3))
+    kwargs = dict(epsilon_r=2.0, orbital_centers=centers, kappa=1.0)
+    dense = compute_static_screened_coulomb_lmo(eri, **kwargs)
+    cut = compute_static_screened_coulomb_lmo(eri, damping_tol=1e-3, **kwargs)
+
+    for name in ("cKDTree", "pdist", "squareform"):
+        monkeypatch.setattr(pyscf_adapter, name, None)
+    assert np.allclose(compute_static_screened_coulomb_lmo(eri, **kwargs), dense)
+    assert np.array_equal(compute_static_screened_coulomb_lmo(eri, damping_tol=1e-3, **kwargs), cut)
+
+
+@pytest.mark.parametrize("shape", [(7,), (20,), (5, 5), (6, 3), (2, 2, 2, 3)])
+def test_static_screening_rejects_malformed_eri_shapes(shape):
+    with pytest.raises(ValueError):
+        compute_static_screened_coulomb_lmo(np.zeros(shape))
+
+
+@pytest.mark.parametrize(
+    ("eri", "n_orb"),
+    [(np.zeros((6, 10)), 3), (np.zeros((2, 2, 2, 2)), 5), (np.zeros((2, 2, 2, 3)), None)],
+)
+def test_eri_full_rejects_mismatched_shapes(eri, n_orb):
+    with pytest.raises(ValueError):
+        eri_full(eri, n_orb)